@@ -2,25 +2,27 @@
 # ============================
 # Standard library imports
 import asyncio
+import concurrent.futures
 import contextlib
 import gzip
 import html
 import io
+import itertools
 import json
 import logging
 import os
+import queue
 import re
 import signal
 import sqlite3
 import subprocess
 import sys
-import tempfile
 import textwrap
 import time
 import traceback
 import typing
 from typing import Optional
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from datetime import datetime, timezone, timedelta
 from datetime import time as datetime_time
 from urllib.parse import urlparse, parse_qs
@@ -58,6 +60,9 @@ DISCORD_BOT_TOKEN = os.getenv('REDDIT_BOT_TOKEN')
 DEBUG_ROLE_ID = int(os.getenv('DEBUG_ROLE_ID'))
 LOG_CHANNEL_ID = int(os.getenv('LOG_CHANNEL_ID'))
 MAX_VIDEO_SIZE = 24 * 1024 * 1024  # 24MB in bytes
+SHOW_AUTHOR_ICON = os.getenv('SHOW_AUTHOR_ICON', '1') == '1'  # Set to 0 to skip the per-author Reddit profile lookup
+MAX_CONCURRENT_SUBSCRIPTIONS = 5  # Subreddits polled at once, keeps bursts within Reddit's rate limit
+SUBMISSION_FETCH_LIMIT = 25  # Newest posts requested per check, reading stops at the first one already seen
 COMMAND_CACHE_FILE = 'command_cache.json'
 
 processed_submissions = {}
@@ -67,7 +72,13 @@ processed_submissions = {}
 # Initialize Discord client
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents)
+class RedditDiscordBot(commands.Bot):
+    async def close(self):
+        # Release the shared HTTP session while the event loop is still running
+        await close_http_session()
+        await super().close()
+
+bot = RedditDiscordBot(command_prefix='!', intents=intents)
 debug_role = discord.Object(id=DEBUG_ROLE_ID)
 bot.tree.default_permissions = discord.Permissions.none()
 
@@ -123,6 +134,15 @@ class DiscordLogHandler(TimedRotatingFileHandler):
         print(f"Next rollover time: {datetime.fromtimestamp(self.rolloverAt)}")
         print("Log rollover completed")
 
+    @staticmethod
+    def compress_log_file(log_file):
+        compressed_log = io.BytesIO()
+        with gzip.open(compressed_log, 'wb') as f_out:
+            with open(log_file, 'rb') as f_in:
+                f_out.writelines(f_in)
+        compressed_log.seek(0)
+        return compressed_log
+
     async def send_log_to_discord(self, log_file):
         current_time = time.time()
         if current_time - self.last_send_time < 86100:  # 24 hour cooldown (23hrs 55 mins this allows for the time it takes to create the file and still still send it to the log channel every day)
@@ -133,11 +153,8 @@ class DiscordLogHandler(TimedRotatingFileHandler):
             channel = self.bot.get_channel(self.log_channel_id)
             if channel and os.path.exists(log_file):
                 print(f"Attempting to send log file: {log_file}")
-                compressed_log = io.BytesIO()
-                with gzip.open(compressed_log, 'wb') as f_out:
-                    with open(log_file, 'rb') as f_in:
-                        f_out.writelines(f_in)
-                compressed_log.seek(0)
+                # Reading and gzipping a full day's log happens in a worker thread so the event loop keeps running
+                compressed_log = await asyncio.to_thread(self.compress_log_file, log_file)
                 
                 compressed_size = compressed_log.getbuffer().nbytes
                 if compressed_size <= 24 * 1024 * 1024:  # 24MB limit
@@ -190,11 +207,9 @@ class DiscordLogHandler(TimedRotatingFileHandler):
     def check_rollover_status(self):
         now = time.time()  # Use time.time() instead of datetime.now()
         rollover_time = self.rolloverAt
-        print(f"Current time: {datetime.fromtimestamp(now)}")
-        print(f"Next rollover time: {datetime.fromtimestamp(rollover_time)}")
         time_until_rollover = rollover_time - now
-        print(f"Time until next rollover: {timedelta(seconds=time_until_rollover)}")
-        print(f"Current rollover at timestamp: {self.rolloverAt}")
+        logger.debug("Current time: %s, next rollover time: %s, time until next rollover: %s, rollover at timestamp: %s",
+                     datetime.fromtimestamp(now), datetime.fromtimestamp(rollover_time), timedelta(seconds=time_until_rollover), self.rolloverAt)
 
 # File handler for all logs
 file_handler = DiscordLogHandler(
@@ -221,10 +236,15 @@ discord_handler = logging.FileHandler('logs/discord_bot.log')
 discord_handler.setLevel(logging.WARNING)
 discord_handler.setFormatter(file_formatter)
 
+# Console and discord_bot.log writes are handed to a background thread through a queue, so they never block the event loop.
+# file_handler stays attached directly: it schedules Discord uploads on the loop and is looked up in logger.handlers
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, stream_handler, discord_handler, respect_handler_level=True)
+log_listener.start()
+
 # Add all handlers to the logger
 logger.addHandler(file_handler)
-logger.addHandler(stream_handler)
-logger.addHandler(discord_handler)
+logger.addHandler(QueueHandler(log_queue))
 
 @tasks.loop(minutes=5)
 async def periodic_log():
@@ -259,17 +279,40 @@ except sqlite3.Error as e:
     logger.error(f"Error connecting to database: {e}", exc_info=True)
     raise
 
+# Tune SQLite for the frequent small writes made by the polling loop
+try:
+    c.execute("PRAGMA journal_mode=WAL")
+    c.execute("PRAGMA synchronous=NORMAL")
+    c.execute("PRAGMA temp_store=MEMORY")
+    c.execute("PRAGMA cache_size=-64000")  # 64MB page cache
+    c.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+    c.execute("PRAGMA busy_timeout=30000")  # Wait up to 30s for a lock instead of failing with 'database is locked'
+    logger.debug("Applied SQLite performance PRAGMAs (WAL, synchronous=NORMAL)")
+except sqlite3.Error as e:
+    logger.error(f"Error applying SQLite PRAGMAs: {e}", exc_info=True)
+
 # Ensure the tables exist with all required columns
 try:
     c.execute('''CREATE TABLE IF NOT EXISTS subscriptions
-                 (subreddit TEXT, channel_id INTEGER, last_check TEXT, last_submission_id TEXT, failed_attempts INTEGER DEFAULT 0, thread_id INTEGER)''')
+                 (subreddit TEXT, channel_id INTEGER, last_check TEXT, last_submission_id TEXT, failed_attempts INTEGER DEFAULT 0, thread_id INTEGER, last_check_ts INTEGER)''')
     logger.debug("Ensured 'subscriptions' table exists")
 except sqlite3.Error as e:
-    logger.error(f"Error creating 'subscriptions' table: {e}", exc_info=True)    
+    logger.error(f"Error creating 'subscriptions' table: {e}", exc_info=True)
 
-try:    
+# Index the (subreddit, channel_id) lookups made every tick, dropping any duplicate rows left by older versions first
+try:
+    c.execute('''DELETE FROM subscriptions WHERE rowid NOT IN
+                 (SELECT MIN(rowid) FROM subscriptions GROUP BY subreddit, channel_id)''')
+    if c.rowcount > 0:
+        logger.warning(f"Removed {c.rowcount} duplicate rows from 'subscriptions'")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_sub_chan ON subscriptions(subreddit, channel_id)")
+    logger.debug("Ensured 'idx_sub_chan' index exists")
+except sqlite3.Error as e:
+    logger.error(f"Error creating 'idx_sub_chan' index: {e}", exc_info=True)
+
+try:
     c.execute('''CREATE TABLE IF NOT EXISTS forum_subscriptions
-                 (subreddit TEXT, channel_id INTEGER, thread_id INTEGER, last_check TEXT, last_submission_id TEXT)''')
+                 (subreddit TEXT, channel_id INTEGER, thread_id INTEGER, last_check TEXT, last_submission_id TEXT, last_check_ts INTEGER)''')
     logger.debug("Ensured 'forum_subscriptions' table exists")
 except sqlite3.Error as e:
     logger.error(f"Error creating 'forum_subscriptions' table: {e}", exc_info=True)
@@ -283,14 +326,25 @@ except sqlite3.Error as e:
 
 try:    
     c.execute('''CREATE TABLE IF NOT EXISTS individual_forum_subscriptions
-                 (subreddit TEXT, channel_id INTEGER, last_check TEXT)''')
+                 (subreddit TEXT, channel_id INTEGER, last_check TEXT, last_check_ts INTEGER)''')
     logger.debug("Ensured 'individual_forum_subscriptions' table exists")
 except sqlite3.Error as e:
     logger.error(f"Error creating 'individual_forum_subscriptions' table: {e}", exc_info=True)
 
+# Same one-row-per-(subreddit, channel_id) guarantee as idx_sub_chan, so subscribing can be a single INSERT OR IGNORE
+try:
+    c.execute('''DELETE FROM individual_forum_subscriptions WHERE rowid NOT IN
+                 (SELECT MIN(rowid) FROM individual_forum_subscriptions GROUP BY subreddit, channel_id)''')
+    if c.rowcount > 0:
+        logger.warning(f"Removed {c.rowcount} duplicate rows from 'individual_forum_subscriptions'")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_individual_forum_sub_chan ON individual_forum_subscriptions(subreddit, channel_id)")
+    logger.debug("Ensured 'idx_individual_forum_sub_chan' index exists")
+except sqlite3.Error as e:
+    logger.error(f"Error creating 'idx_individual_forum_sub_chan' index: {e}", exc_info=True)
+
 try:    
     c.execute('''CREATE TABLE IF NOT EXISTS submission_tracking
-                 (subreddit TEXT, channel_id INTEGER, last_check TEXT, last_submission_id TEXT,
+                 (subreddit TEXT, channel_id INTEGER, last_check TEXT, last_submission_id TEXT, last_check_ts INTEGER,
                  PRIMARY KEY (subreddit, channel_id))''')
     logger.debug("Ensured 'submission_tracking' table exists")
 except sqlite3.Error as e:
@@ -335,6 +389,37 @@ if 'last_submission_id' not in columns:
     c.execute("ALTER TABLE subscriptions ADD COLUMN last_submission_id TEXT")
     conn.commit()
 
+# last_check is now kept as Unix seconds in last_check_ts, convert any rows still holding only the old text timestamp
+def backfill_last_check_ts(table_name):
+    ensure_column_exists(table_name, "last_check_ts", "INTEGER")
+    try:
+        c.execute(f"SELECT rowid, last_check FROM {table_name} WHERE last_check_ts IS NULL")
+        rows = c.fetchall()
+        for rowid, last_check in rows:
+            try:
+                last_check_ts = int(datetime.fromisoformat(last_check).replace(tzinfo=timezone.utc).timestamp())
+            except (TypeError, ValueError):
+                logger.warning(f"Unparseable last_check {last_check!r} in {table_name} row {rowid}, resetting to now")
+                last_check_ts = int(time.time())
+            c.execute(f"UPDATE {table_name} SET last_check_ts = ? WHERE rowid = ?", (last_check_ts, rowid))
+        conn.commit()
+        if rows:
+            logger.info(f"Converted {len(rows)} last_check values in {table_name} to Unix timestamps")
+    except sqlite3.Error as e:
+        logger.error(f"Error converting last_check values in {table_name}: {e}", exc_info=True)
+
+backfill_last_check_ts("subscriptions")
+backfill_last_check_ts("submission_tracking")
+backfill_last_check_ts("forum_subscriptions")
+backfill_last_check_ts("individual_forum_subscriptions")
+
+# Refresh the query planner's statistics so it picks up indexes such as idx_sub_chan
+try:
+    c.execute("ANALYZE")
+    conn.commit()
+except sqlite3.Error as e:
+    logger.error(f"Error running ANALYZE: {e}", exc_info=True)
+
 # Initialize button visibility settings
 button_list = ['Reddit Post', 'Watch Video', 'RedGIFs', 'YouTube Link', 'Image Gallery', 'Web Link']
 for button in button_list:
@@ -347,6 +432,27 @@ conn.commit()
 def truncate_string(string, max_length):
     return (string[:max_length-3] + '...') if len(string) > max_length else string
 
+def pack_lines(lines, limit=1900):
+    # Greedily pack whole lines into messages of at most `limit` characters, only splitting a line longer than the limit
+    chunks, current, current_len = [], [], 0
+    for line in lines:
+        while len(line) > limit:
+            line_part, line = line[:limit], line[limit:]
+            if current:
+                chunks.append("".join(current))
+                current, current_len = [], 0
+            chunks.append(line_part)
+        if not line:
+            continue
+        if current_len + len(line) > limit:
+            chunks.append("".join(current))
+            current, current_len = [], 0
+        current.append(line)
+        current_len += len(line)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
 async def is_valid_subreddit(reddit, subreddit_name):
     try:
         subreddit = await reddit.subreddit(subreddit_name, fetch=True)
@@ -367,36 +473,50 @@ def ensure_valid_url(url):
         return f'https://{url}'
     return url
 
-def get_button_visibility():
+# In-memory copy of the button_visibility table, kept in sync by set_button_visibility
+# and re-read once per polling tick by refresh_button_visibility to pick up changes made outside the bot
+_button_visibility_cache: dict[str, bool] = {}
+
+def _update_button_visibility_cache(rows):
+    _button_visibility_cache.clear()
+    _button_visibility_cache.update((button_name, bool(is_visible)) for button_name, is_visible in rows)
+
+def load_button_visibility():
     try:
         c.execute("SELECT button_name, is_visible FROM button_visibility")
-        result = dict(c.fetchall())
-        logger.debug(f"Retrieved button visibility settings: {result}")
-        return result
+        _update_button_visibility_cache(c.fetchall())
+        logger.debug(f"Loaded button visibility settings: {_button_visibility_cache}")
     except sqlite3.Error as e:
-        logger.error(f"Error retrieving button visibility settings: {e}", exc_info=True)
-        return {}
+        logger.error(f"Error loading button visibility settings: {e}", exc_info=True)
 
-def get_flair_settings(channel_id):
+async def refresh_button_visibility():
     try:
-        with sqlite3.connect('subscriptions.db', isolation_level=None) as conn:
-            conn.execute("PRAGMA query_only = ON")
-            conn.execute("PRAGMA cache_size = 0")
-            c = conn.cursor()
-            c.execute("SELECT max_flairs, flair_enabled, blacklisted_flairs FROM forum_flair_settings WHERE channel_id = ?", (channel_id,))
-            result = c.fetchone()
-            logger.debug(f"Raw database result for channel {channel_id}: {result}")
-            if result:
-                max_flairs, flair_enabled, blacklisted_flairs = result
-                try:
-                    blacklisted_flairs_list = json.loads(blacklisted_flairs or '[]')
-                except json.JSONDecodeError:
-                    logger.error(f"Error decoding blacklisted flairs for channel {channel_id}: {blacklisted_flairs}")
-                    blacklisted_flairs_list = []
-                logger.info(f"Flair settings retrieved for channel {channel_id}: max_flairs={max_flairs}, flair_enabled={bool(flair_enabled)}, blacklisted_flairs={blacklisted_flairs_list}")
-                return max_flairs, bool(flair_enabled), blacklisted_flairs_list
-            logger.info(f"No flair settings found for channel {channel_id}, using defaults")
-            return 20, True, []  # Default values
+        _update_button_visibility_cache(await db_fetchall("SELECT button_name, is_visible FROM button_visibility"))
+        logger.debug("Refreshed button visibility settings: %s", _button_visibility_cache)
+    except sqlite3.Error as e:
+        logger.error(f"Error refreshing button visibility settings: {e}", exc_info=True)
+
+def get_button_visibility():
+    return _button_visibility_cache
+
+load_button_visibility()
+
+async def get_flair_settings(channel_id):
+    try:
+        rows = await db_fetchall("SELECT max_flairs, flair_enabled, blacklisted_flairs FROM forum_flair_settings WHERE channel_id = ?", (channel_id,))
+        result = rows[0] if rows else None
+        logger.debug(f"Raw database result for channel {channel_id}: {result}")
+        if result:
+            max_flairs, flair_enabled, blacklisted_flairs = result
+            try:
+                blacklisted_flairs_list = json.loads(blacklisted_flairs or '[]')
+            except json.JSONDecodeError:
+                logger.error(f"Error decoding blacklisted flairs for channel {channel_id}: {blacklisted_flairs}")
+                blacklisted_flairs_list = []
+            logger.info(f"Flair settings retrieved for channel {channel_id}: max_flairs={max_flairs}, flair_enabled={bool(flair_enabled)}, blacklisted_flairs={blacklisted_flairs_list}")
+            return max_flairs, bool(flair_enabled), blacklisted_flairs_list
+        logger.info(f"No flair settings found for channel {channel_id}, using defaults")
+        return 20, True, []  # Default values
     except sqlite3.Error as e:
         logger.error(f"Database error in get_flair_settings for channel {channel_id}: {e}", exc_info=True)
         return 20, True, []  # Default values in case of error
@@ -426,14 +546,130 @@ def get_db_connection():
             conn.close()
             logger.debug("Database connection closed")
 
+# One HTTP session (and connection pool) shared by Reddit and media requests, created lazily inside the event loop
+http_session: aiohttp.ClientSession | None = None
+
+def get_http_session():
+    global http_session
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=60)
+        http_session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=300, connect=30))
+    return http_session
+
+async def close_http_session():
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+        logger.info("Shared HTTP session closed")
+
+# The worker thread gets its own connection, so its commits and rollbacks can never land
+# in the middle of a command that is still using conn on the event loop
+db_worker_conn = None
+
+def _open_db_worker_conn():
+    global db_worker_conn
+    db_worker_conn = sqlite3.connect('subscriptions.db')
+    db_worker_conn.execute("PRAGMA synchronous=NORMAL")
+    db_worker_conn.execute("PRAGMA temp_store=MEMORY")
+    db_worker_conn.execute("PRAGMA cache_size=-64000")
+    db_worker_conn.execute("PRAGMA mmap_size=268435456")
+    db_worker_conn.execute("PRAGMA busy_timeout=30000")
+
+def _close_db_worker_conn():
+    if db_worker_conn is not None:
+        db_worker_conn.close()
+
+# A single worker thread keeps off-loop database calls ordered and never overlapping
+db_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite', initializer=_open_db_worker_conn)
+
+def _db_fetchall(sql, params):
+    return db_worker_conn.execute(sql, params).fetchall()
+
+# Writes run inside `with db_worker_conn:` so they commit on success and roll back if the statement fails
+def _db_execute(sql, params):
+    with db_worker_conn:
+        return db_worker_conn.execute(sql, params).rowcount
+
+def _db_executemany(sql, seq_of_params):
+    with db_worker_conn:
+        return db_worker_conn.executemany(sql, seq_of_params).rowcount
+
+def _db_execute_all(statements):
+    with db_worker_conn:
+        return sum(db_worker_conn.execute(sql, params).rowcount for sql, params in statements)
+
+async def db_fetchall(sql, params=()):
+    # Run a SELECT on the worker connection without blocking the event loop
+    return await asyncio.get_running_loop().run_in_executor(db_executor, _db_fetchall, sql, params)
+
+async def db_execute(sql, params=()):
+    # Run a write and commit it without blocking the event loop, returns the affected row count
+    return await asyncio.get_running_loop().run_in_executor(db_executor, _db_execute, sql, params)
+
+async def db_executemany(sql, seq_of_params):
+    # Run the same write for every parameter set in one transaction, returns the total affected row count
+    return await asyncio.get_running_loop().run_in_executor(db_executor, _db_executemany, sql, list(seq_of_params))
+
+async def db_execute_all(statements):
+    # Run a list of (sql, params) writes in one transaction, all or none are applied
+    return await asyncio.get_running_loop().run_in_executor(db_executor, _db_execute_all, list(statements))
+
+# Regular subscription rows keyed by (subreddit, channel_id) -> (last_check_ts, last_submission_id).
+# Loaded once and kept current by update_subscription_cache once new state is saved, reloaded after subscribe/unsubscribe/cleanup change the table.
+# PRAGMA data_version on the worker connection only changes when another connection commits (commands, debug commands,
+# manual edits), which also forces a reload
+_subscription_cache: dict[tuple[str, int], tuple[int, str | None]] | None = None
+_subscription_cache_data_version = None
+
+async def get_subscriptions():
+    global _subscription_cache, _subscription_cache_data_version
+    data_version = (await db_fetchall("PRAGMA data_version"))[0][0]
+    if _subscription_cache is None or data_version != _subscription_cache_data_version:
+        rows = await db_fetchall("SELECT subreddit, channel_id, last_check_ts, last_submission_id FROM subscriptions")
+        _subscription_cache = {(subreddit, channel_id): (last_check_ts, last_submission_id)
+                               for subreddit, channel_id, last_check_ts, last_submission_id in rows}
+        _subscription_cache_data_version = data_version
+        logger.debug(f"Loaded {len(_subscription_cache)} regular subscriptions into cache")
+    return [(subreddit, channel_id, last_check_ts, last_submission_id)
+            for (subreddit, channel_id), (last_check_ts, last_submission_id) in _subscription_cache.items()]
+
+def invalidate_subscription_cache():
+    global _subscription_cache
+    _subscription_cache = None
+
+def update_subscription_cache(updates):
+    # Called with SUBSCRIPTION_STATE_UPDATE parameters only after they have been written, so the cache never runs ahead of the table
+    if _subscription_cache is None:
+        return
+    for last_check_ts, last_submission_id, subreddit, channel_id in updates:
+        if (subreddit, channel_id) in _subscription_cache:
+            _subscription_cache[(subreddit, channel_id)] = (last_check_ts, last_submission_id)
+
+# Reddit image URL patterns, compiled once as they run against every self post
+_REDDIT_IMAGE_RE = re.compile(r'(https?://(?:i\.redd\.it|preview\.redd\.it)/\S+?\.(?:jpg|png|gif))(?:\?[^\)\s]+)?')
+_REDDIT_IMAGE_URL_RE = re.compile(r'https?://(?:preview|i)\.redd\.it/\S+')
+# Patterns used by clean_selftext, in the order they are applied
+_MD_LINK_RE = re.compile(r'\[(.*?)\]\((.*?)\)')
+_BRACKETS_RE = re.compile(r'[\[\]]')
+_TRAILING_PAREN_RE = re.compile(r'\($')
+_LINE_END_PAREN_RE = re.compile(r'\($', re.MULTILINE)
+_NBSP_RE = re.compile(r'&nbsp;')
+# Runs of blank (or whitespace-only) lines collapse to a single paragraph break, runs of spaces to one space,
+# both in the same pass
+_WHITESPACE_RE = re.compile(r'(\n\s*\n)| +')
+
+def _collapse_whitespace(match):
+    return '\n\n' if match.group(1) else ' '
+
+# Inline Reddit video player links, which can only be viewed on Reddit itself
+_REDDIT_VIDEO_PLAYER_RE = re.compile(r'https://reddit\.com/link/[^/]+/video/[^/]+/player')
+
 def extract_all_images(text):
-    # Pattern to match all Reddit image URLs
-    image_pattern = r'(https?://(?:i\.redd\.it|preview\.redd\.it)/\S+?\.(?:jpg|png|gif))(?:\?[^\)\s]+)?'
-    return re.findall(image_pattern, text)
+    # Match all Reddit image URLs (preview.redd.it and i.redd.it) in a single pass, keeping first-seen order without repeats
+    return list(dict.fromkeys(_REDDIT_IMAGE_RE.findall(text)))
 
 def clean_selftext(selftext):
     # Remove URLs from preview.redd.it and i.redd.it
-    cleaned_text = re.sub(r'https?://(?:preview|i)\.redd\.it/\S+', '', selftext)
+    cleaned_text = _REDDIT_IMAGE_URL_RE.sub('', selftext)
     
     # Handle markdown links: if text and URL are different, keep both; if they're the same, keep only one
     def replace_link(match):
@@ -442,29 +678,39 @@ def clean_selftext(selftext):
             return url
         return f"{text} {url}"  # Remove parentheses around URL
     
-    cleaned_text = re.sub(r'\[(.*?)\]\((.*?)\)', replace_link, cleaned_text)
+    cleaned_text = _MD_LINK_RE.sub(replace_link, cleaned_text)
     
     # Remove any remaining square brackets
-    cleaned_text = re.sub(r'[\[\]]', '', cleaned_text)
+    cleaned_text = _BRACKETS_RE.sub('', cleaned_text)
     
     # Remove any remaining parentheses at the end of lines or strings
-    cleaned_text = re.sub(r'\($', '', cleaned_text)
-    cleaned_text = re.sub(r'\($', '', cleaned_text, flags=re.MULTILINE)
+    cleaned_text = _TRAILING_PAREN_RE.sub('', cleaned_text)
+    cleaned_text = _LINE_END_PAREN_RE.sub('', cleaned_text)
     
     # Replace &nbsp; with a space
-    cleaned_text = re.sub(r'&nbsp;', ' ', cleaned_text)
+    cleaned_text = _NBSP_RE.sub(' ', cleaned_text)
     
     # Unescape HTML entities
     cleaned_text = html.unescape(cleaned_text)
     
     # Remove extra whitespace while preserving line breaks
-    cleaned_text = re.sub(r' +', ' ', cleaned_text)
-    cleaned_text = re.sub(r'\n\s*\n', '\n\n', cleaned_text)
+    cleaned_text = _WHITESPACE_RE.sub(_collapse_whitespace, cleaned_text)
     
     return cleaned_text.strip()
 
 def extract_image_url(submission):
-    parsed_url = urlparse(submission.url)
+    url = submission.url
+    # Most links are classified with plain string checks, only unusual ones fall through to urlparse
+    if 'preview.redd.it' not in url and 'i.redd.it' not in url and 'i.imgur.com' not in url:
+        return None
+    if url.startswith(('https://i.redd.it/', 'https://i.imgur.com/')):
+        return url
+    if url.startswith('https://preview.redd.it/'):
+        path = url[len('https://preview.redd.it'):].partition('?')[0].partition('#')[0]
+        if ';' not in path:
+            return f"https://i.redd.it{path}" if path.endswith(('.jpg', '.png', '.gif')) else None
+
+    parsed_url = urlparse(url)
     if parsed_url.netloc == 'preview.redd.it':
         path = parsed_url.path
         if path.endswith(('.jpg', '.png', '.gif')):
@@ -473,7 +719,18 @@ def extract_image_url(submission):
         return submission.url
     return None
 
+# Link hosts that get special handling, found in one pass over the URL instead of a substring test per host
+_URL_KIND_RE = re.compile(r'(?P<youtube>youtu\.be|youtube\.com)|(?P<redgifs>redgifs\.com)|(?P<gallery>/gallery/)')
+
+def classify_url(url):
+    # Returns 'youtube', 'redgifs', 'gallery' or None. A URL with several markers gets the kind of the leftmost one
+    match = _URL_KIND_RE.search(url)
+    return match.lastgroup if match else None
+
 def extract_video_id(url):
+    # Skip parsing for the vast majority of links that are not YouTube at all
+    if 'youtu' not in url:
+        return None
     parsed_url = urlparse(url)
     if parsed_url.netloc in ('youtu.be', 'www.youtu.be'):
         return parsed_url.path[1:]
@@ -483,15 +740,15 @@ def extract_video_id(url):
     return None
 
 async def is_valid_image_url(url):
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.head(url, allow_redirects=True, timeout=5) as response:
-                if response.status == 200:
-                    content_type = response.headers.get('Content-Type', '')
-                    logger.debug(f"Checked image URL {url}: status={response.status}, content_type={content_type}")
-                    return content_type.startswith('image/')
-        except Exception as e:
-            logger.warning(f"Error checking image URL {url}: {e}")
+    session = get_http_session()
+    try:
+        async with session.head(url, allow_redirects=True, timeout=5) as response:
+            if response.status == 200:
+                content_type = response.headers.get('Content-Type', '')
+                logger.debug(f"Checked image URL {url}: status={response.status}, content_type={content_type}")
+                return content_type.startswith('image/')
+    except Exception as e:
+        logger.warning(f"Error checking image URL {url}: {e}")
     logger.debug(f"Invalid image URL: {url}")
     return False
 
@@ -501,15 +758,16 @@ async def sync_forum_tags(forum_channel):
         db_tags = set(row[0] for row in c.fetchall())
         discord_tags = set(tag.name for tag in forum_channel.available_tags)
 
-        for tag_name in db_tags - discord_tags:
-            c.execute("DELETE FROM forum_tags WHERE channel_id = ? AND tag_name = ?", (forum_channel.id, tag_name))
-            logger.info(f"Removed tag '{tag_name}' from database for channel {forum_channel.id}")
+        # `with conn:` commits the changes, or rolls them back if a statement fails
+        with conn:
+            for tag_name in db_tags - discord_tags:
+                c.execute("DELETE FROM forum_tags WHERE channel_id = ? AND tag_name = ?", (forum_channel.id, tag_name))
+                logger.info(f"Removed tag '{tag_name}' from database for channel {forum_channel.id}")
 
-        for tag_name in discord_tags - db_tags:
-            c.execute("INSERT OR IGNORE INTO forum_tags (channel_id, tag_name) VALUES (?, ?)", (forum_channel.id, tag_name))
-            logger.info(f"Added tag '{tag_name}' to database for channel {forum_channel.id}")
+            for tag_name in discord_tags - db_tags:
+                c.execute("INSERT OR IGNORE INTO forum_tags (channel_id, tag_name) VALUES (?, ?)", (forum_channel.id, tag_name))
+                logger.info(f"Added tag '{tag_name}' to database for channel {forum_channel.id}")
 
-        conn.commit()
         logger.info(f"Forum tags synced for channel {forum_channel.id}")
     except sqlite3.Error as e:
         logger.error(f"Database error in sync_forum_tags for channel {forum_channel.id}: {e}", exc_info=True)
@@ -538,9 +796,12 @@ def has_debug_role():
 
 def command_to_dict(cmd):
     try:
+        default_permissions = getattr(cmd, 'default_permissions', None)
         command_dict = {
             'name': cmd.name,
             'description': cmd.description,
+            # Included so a permission change alone is enough to trigger a sync
+            'default_permissions': default_permissions.value if default_permissions is not None else None,
         }
         if hasattr(cmd, 'options'):
             command_dict['options'] = [{'name': opt.name, 'description': opt.description, 'type': opt.type.value} for opt in cmd.options]
@@ -574,13 +835,14 @@ def update_command_cache(bot):
 # =======================
 
 @backoff.on_exception(backoff.expo, (asyncprawcore.exceptions.ServerError, asyncprawcore.exceptions.RequestException), max_tries=3)
-async def fetch_new_submissions(subreddit, last_check, limit: int = 10) -> list:
-    logger.debug(f"Fetching new submissions for r/{subreddit.display_name}, last_check: {last_check}, limit: {limit}")
+async def fetch_new_submissions(subreddit, last_check_ts, limit: int = SUBMISSION_FETCH_LIMIT) -> list:
+    # last_check_ts is Unix seconds, compared directly against each submission's created_utc.
+    # r/new is newest first, so the listing is only read up to the first post at or before last_check_ts
+    logger.debug(f"Fetching new submissions for r/{subreddit.display_name}, last_check_ts: {last_check_ts}, limit: {limit}")
     new_submissions = []
     try:
         async for submission in subreddit.new(limit=limit):
-            submission_time = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
-            if submission_time <= last_check:
+            if submission.created_utc <= last_check_ts:
                 break
             new_submissions.append(submission)
         logger.info(f"Fetched {len(new_submissions)} new submissions for r/{subreddit.display_name}")
@@ -598,6 +860,48 @@ async def fetch_new_submissions(subreddit, last_check, limit: int = 10) -> list:
         logger.info(f"Unexpected error fetching submissions for r/{subreddit.display_name}: {str(e)}", exc_info=True)
     return new_submissions
 
+# Author icons keyed by username, so each author is loaded at most once an hour
+AUTHOR_ICON_TTL = 3600
+AUTHOR_ICON_CACHE_SIZE = 1024
+author_icon_cache: dict[str, tuple[str | None, float]] = {}
+# Lookups in progress, so concurrent posts by the same author wait for one profile request
+author_icon_inflight: dict[str, asyncio.Future] = {}
+
+async def get_author_icon(author):
+    if not SHOW_AUTHOR_ICON or not author:
+        return None
+    cached = author_icon_cache.get(author.name)
+    if cached and time.monotonic() - cached[1] < AUTHOR_ICON_TTL:
+        return cached[0]
+    inflight = author_icon_inflight.get(author.name)
+    if inflight is not None:
+        # Shielded so a cancelled waiter does not cancel the lookup's future for everyone else
+        return await asyncio.shield(inflight)
+    inflight = author_icon_inflight[author.name] = asyncio.get_running_loop().create_future()
+    icon_url = None
+    try:
+        try:
+            await author.load()
+            icon_url = getattr(author, 'icon_img', None)
+        except (asyncprawcore.exceptions.NotFound, asyncprawcore.exceptions.Forbidden) as e:
+            # Deleted or suspended accounts fail every time, so the miss is cached like a found icon
+            logger.info(f"Error fetching author details for {author.name}: {e}")
+        except Exception as e:
+            # Timeouts, rate limits and server errors are not cached, so the author's next post tries again
+            logger.info(f"Error fetching author details for {author.name}: {e}")
+            return None
+        # Re-insert so the entry moves to the end, then drop the oldest entries once the cache is full
+        author_icon_cache.pop(author.name, None)
+        while len(author_icon_cache) >= AUTHOR_ICON_CACHE_SIZE:
+            author_icon_cache.pop(next(iter(author_icon_cache)))
+        author_icon_cache[author.name] = (icon_url, time.monotonic())
+    finally:
+        # Waiters always get an answer, None if this lookup failed or was cancelled
+        del author_icon_inflight[author.name]
+        if not inflight.done():
+            inflight.set_result(icon_url)
+    return icon_url
+
 async def get_primary_image_url(submission):
     logger.debug(f"Getting primary image URL for submission {submission.id}")
     
@@ -678,20 +982,34 @@ async def get_reddit_video_url(submission):
     logger.info(f"No Reddit video URL found for submission {submission.id}")
     return None, None
 
+# oEmbed title/thumbnail per YouTube video ID, so a video re-shared across subreddits is only looked up once a day
+YOUTUBE_INFO_TTL = 86400
+YOUTUBE_INFO_CACHE_SIZE = 1024
+youtube_info_cache: dict[str, tuple[tuple[str, str | None], float]] = {}
+
 async def get_youtube_info(video_id):
+    cached = youtube_info_cache.get(video_id)
+    if cached and time.monotonic() - cached[1] < YOUTUBE_INFO_TTL:
+        logger.debug(f"Using cached YouTube info for video ID: {video_id}")
+        return cached[0]
     logger.debug(f"Getting YouTube info for video ID: {video_id}")
     url = f"https://www.youtube.com/oembed?url=http://www.youtube.com/watch?v={video_id}&format=json"
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"Successfully retrieved YouTube info for video ID: {video_id}")
-                    return data.get('title', 'YouTube Video'), data.get('thumbnail_url')
-                else:
-                    logger.info(f"Failed to retrieve YouTube info for video ID: {video_id}. Status: {response.status}")
-        except Exception as e:
-            logger.error(f"Error retrieving YouTube info for video ID: {video_id}. Error: {str(e)}", exc_info=True)
+    try:
+        async with get_http_session().get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                logger.info(f"Successfully retrieved YouTube info for video ID: {video_id}")
+                info = (data.get('title', 'YouTube Video'), data.get('thumbnail_url'))
+                # Only successful lookups are cached, drop the oldest entry once the cache is full
+                youtube_info_cache.pop(video_id, None)
+                if len(youtube_info_cache) >= YOUTUBE_INFO_CACHE_SIZE:
+                    youtube_info_cache.pop(next(iter(youtube_info_cache)))
+                youtube_info_cache[video_id] = (info, time.monotonic())
+                return info
+            else:
+                logger.info(f"Failed to retrieve YouTube info for video ID: {video_id}. Status: {response.status}")
+    except Exception as e:
+        logger.error(f"Error retrieving YouTube info for video ID: {video_id}. Error: {str(e)}", exc_info=True)
     return 'YouTube Video', None
     
 async def sync_tree_with_backoff(commands=None, guild=None, max_retries=5):
@@ -719,6 +1037,41 @@ async def sync_tree_with_backoff(commands=None, guild=None, max_retries=5):
 # 7. Discord Embed and Message Functions
 # ======================================
 
+class TokenBucket:
+    # Allows `rate` acquisitions per `per` seconds, sleeping (without blocking the loop) once the bucket is empty
+    def __init__(self, rate, per):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated_at) * self.rate / self.per)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+
+# Stay under Discord's limits (5 messages per 5s per channel, ~50 requests per 10s overall) instead of hitting 429s
+CHANNEL_SEND_RATE = (5, 5)
+GLOBAL_SEND_RATE = (50, 10)
+channel_send_buckets: dict[int, TokenBucket] = {}
+global_send_bucket = TokenBucket(*GLOBAL_SEND_RATE)
+
+async def send_rate_limited(target, *args, **kwargs):
+    # Drop-in for target.send() that waits for a free slot first, returns the sent message and lets errors propagate
+    bucket = channel_send_buckets.get(target.id)
+    if bucket is None:
+        bucket = channel_send_buckets[target.id] = TokenBucket(*CHANNEL_SEND_RATE)
+    await bucket.acquire()
+    await global_send_bucket.acquire()
+    return await target.send(*args, **kwargs)
+
 # This function is specifically designed for use with process_individual_forum_subscriptions
 async def create_simple_reddit_embed(submission):
     logger.debug(f"Creating simple Reddit embed for submission {submission.id}")
@@ -751,8 +1104,10 @@ async def create_simple_reddit_embed(submission):
                 return item.get('s', {}).get('u')
         return None
 
+    url_kind = classify_url(processing_submission.url)
+
     # Check for YouTube video
-    if 'youtu.be' in processing_submission.url or 'youtube.com' in processing_submission.url:
+    if url_kind == 'youtube':
         youtube_id = extract_video_id(processing_submission.url)
         if youtube_id:
             thumbnail_url = f"https://img.youtube.com/vi/{youtube_id}/maxresdefault.jpg"
@@ -761,7 +1116,7 @@ async def create_simple_reddit_embed(submission):
             logger.debug(f"Set YouTube thumbnail for submission {processing_submission.id}")
 
     # Check for RedGIFs thumbnail
-    if 'redgifs.com' in processing_submission.url:
+    if url_kind == 'redgifs':
         if hasattr(processing_submission, 'preview') and 'images' in processing_submission.preview:
             try:
                 image_url = processing_submission.preview['images'][0]['source']['url']
@@ -880,50 +1235,50 @@ async def create_simple_reddit_embed(submission):
     return embed
 
 async def send_image_carousel(channel, image_urls, view=None):
-    print(f"Debug: send_image_carousel received {len(image_urls)} images")
+    logger.debug("send_image_carousel received %d images", len(image_urls))
     files = []
     oversized_images = []
-    async with aiohttp.ClientSession() as session:
-        for url in image_urls:
-            url = url.replace('preview.redd.it', 'i.redd.it')
-            print(f"Debug: Processing image URL: {url}")
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    content_length = int(resp.headers.get('Content-Length', 0))
-                    if content_length <= MAX_VIDEO_SIZE:
-                        data = await resp.read()
-                        file_extension = url.split('.')[-1].split('?')[0].lower()
-                        filename = f"image.{file_extension}"
-                        files.append(discord.File(io.BytesIO(data), filename=filename))
-                        print(f"Debug: Successfully added image {filename} to files list")
-                    else:
-                        oversized_images.append(url)
-                        print(f"Debug: Image {url} exceeds size limit, added to oversized images list")
+    session = get_http_session()
+    for url in image_urls:
+        url = url.replace('preview.redd.it', 'i.redd.it')
+        logger.debug("Processing image URL: %s", url)
+        async with session.get(url) as resp:
+            if resp.status == 200:
+                content_length = int(resp.headers.get('Content-Length', 0))
+                if content_length <= MAX_VIDEO_SIZE:
+                    data = await resp.read()
+                    file_extension = url.split('.')[-1].split('?')[0].lower()
+                    filename = f"image.{file_extension}"
+                    files.append(discord.File(io.BytesIO(data), filename=filename))
+                    logger.debug("Successfully added image %s to files list", filename)
                 else:
-                    print(f"Debug: Failed to fetch image from {url}. Status code: {resp.status}")
+                    oversized_images.append(url)
+                    logger.debug("Image %s exceeds size limit, added to oversized images list", url)
+            else:
+                logger.debug("Failed to fetch image from %s. Status code: %s", url, resp.status)
     
     if files:
-        print(f"Debug: Sending {len(files)} images to Discord")
+        logger.debug("Sending %d images to Discord", len(files))
         # Send up to 10 images in a single message
         for i in range(0, len(files), 10):
             is_last_chunk = (i + 10 >= len(files))
             try:
                 if hasattr(channel, 'thread'):
                     if is_last_chunk and view:
-                        await channel.thread.send(files=files[i:i+10], view=view)
+                        await send_rate_limited(channel.thread, files=files[i:i+10], view=view)
                     else:
-                        await channel.thread.send(files=files[i:i+10])
+                        await send_rate_limited(channel.thread, files=files[i:i+10])
                 else:
                     if is_last_chunk and view:
-                        await channel.send(files=files[i:i+10], view=view)
+                        await send_rate_limited(channel, files=files[i:i+10], view=view)
                     else:
-                        await channel.send(files=files[i:i+10])
+                        await send_rate_limited(channel, files=files[i:i+10])
             except discord.HTTPException as e:
-                print(f"Error sending images: {e}")
+                logger.warning("Error sending images: %s", e)
                 # If sending fails, add these images to the oversized list
                 oversized_images.extend([f.filename for f in files[i:i+10]])
     else:
-        print("Debug: No files to send")
+        logger.debug("No files to send")
 
     return files, oversized_images
 
@@ -941,8 +1296,10 @@ async def create_reddit_embed(submission):
                 return item.get('s', {}).get('u')
         return None
 
+    url_kind = classify_url(submission.url)
+
     # Check for YouTube video
-    if 'youtu.be' in submission.url or 'youtube.com' in submission.url:
+    if url_kind == 'youtube':
         youtube_id = extract_video_id(submission.url)
         if youtube_id:
             thumbnail_url = f"https://img.youtube.com/vi/{youtube_id}/maxresdefault.jpg"
@@ -950,7 +1307,7 @@ async def create_reddit_embed(submission):
             image_set = True
 
     # Check for RedGIFs thumbnail
-    if 'redgifs.com' in submission.url:
+    if url_kind == 'redgifs':
         if hasattr(submission, 'preview') and 'images' in submission.preview:
             try:
                 image_url = submission.preview['images'][0]['source']['url']
@@ -971,7 +1328,7 @@ async def create_reddit_embed(submission):
         if not image_set and hasattr(submission, 'thumbnail') and submission.thumbnail != 'default':
             embed.set_image(url=submission.thumbnail)
             image_set = True
-            print(f"Reddit Video thumbnail URL: {submission.thumbnail}")  # Debug logging
+            logger.debug("Reddit Video thumbnail URL: %s", submission.thumbnail)
 
     # Check for gallery
     if not image_set and hasattr(submission, 'is_gallery') and submission.is_gallery:
@@ -1020,7 +1377,8 @@ async def create_reddit_embed(submission):
         fallback_image_url = "https://www.redditstatic.com/desktop2x/img/favicon/android-icon-512x512.png"
         embed.set_image(url=fallback_image_url)
     
-    print(f"Reddit Embed data for submission {submission.id}: {embed.to_dict()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Reddit Embed data for submission %s: %s", submission.id, embed.to_dict())
     return embed
 
 def create_button(label, url, button_visibility):
@@ -1028,8 +1386,18 @@ def create_button(label, url, button_visibility):
         return discord.ui.Button(label=label, url=ensure_valid_url(url))
     return None
 
+def add_buttons(view, button_visibility, *buttons):
+    # Add a link button for each (label, url) pair whose label is visible, hidden ones are never built
+    for label, url in buttons:
+        if url and button_visibility.get(label, True):
+            view.add_item(discord.ui.Button(label=label, url=ensure_valid_url(url)))
+    return view
+
+def create_view(button_visibility, *buttons):
+    return add_buttons(discord.ui.View(), button_visibility, *buttons)
+
 async def send_suppressed_message(channel, content=None, embed=None, view=None, file=None):
-    return await channel.send(
+    return await send_rate_limited(channel,
         content=content, 
         embed=embed, 
         view=view, 
@@ -1045,7 +1413,7 @@ async def get_flair_as_tag(submission, forum_channel):
         logger.info(f"No flair for submission {submission.id}")
         return None
 
-    max_flairs, flair_enabled, blacklisted_flairs = get_flair_settings(forum_channel.id)
+    max_flairs, flair_enabled, blacklisted_flairs = await get_flair_settings(forum_channel.id)
     logger.info(f"Flair settings for channel {forum_channel.id}: max_flairs={max_flairs}, flair_enabled={flair_enabled}, blacklisted_flairs={blacklisted_flairs}")
 
     if not flair_enabled:
@@ -1083,10 +1451,8 @@ async def get_flair_as_tag(submission, forum_channel):
 
 async def sync_forum_tags_function(forum: discord.ForumChannel):
     try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            c.execute("SELECT blacklisted_flairs FROM forum_flair_settings WHERE channel_id = ?", (forum.id,))
-            result = c.fetchone()
+        rows = await db_fetchall("SELECT blacklisted_flairs FROM forum_flair_settings WHERE channel_id = ?", (forum.id,))
+        result = rows[0] if rows else None
         
         if result and result[0]:
             blacklist = json.loads(result[0])
@@ -1118,14 +1484,13 @@ async def sync_forum_tags(forum_channel):
     db_tags = set(row[0] for row in c.fetchall())
     discord_tags = set(tag.name for tag in forum_channel.available_tags)
 
-    for tag_name in db_tags - discord_tags:
-        c.execute("DELETE FROM forum_tags WHERE channel_id = ? AND tag_name = ?", (forum_channel.id, tag_name))
-
-    # Add tags from Discord that aren't in our database
-    for tag_name in discord_tags - db_tags:
-        c.execute("INSERT OR IGNORE INTO forum_tags (channel_id, tag_name) VALUES (?, ?)", (forum_channel.id, tag_name))
+    with conn:
+        for tag_name in db_tags - discord_tags:
+            c.execute("DELETE FROM forum_tags WHERE channel_id = ? AND tag_name = ?", (forum_channel.id, tag_name))
 
-    conn.commit()
+        # Add tags from Discord that aren't in our database
+        for tag_name in discord_tags - db_tags:
+            c.execute("INSERT OR IGNORE INTO forum_tags (channel_id, tag_name) VALUES (?, ?)", (forum_channel.id, tag_name))
 
 # 9. Submission Processing Functions
 # ==================================
@@ -1135,11 +1500,11 @@ def clean_video_post_text(selftext, video_urls):
     for url in video_urls:
         selftext = selftext.replace(url, '')
     
-    # Split into lines, remove empty lines, and rejoin
-    lines = [line.strip() for line in selftext.split('\n') if line.strip() and line.strip() != '&#x200B;']
-    cleaned_text = '\n\n'.join(lines)  # Use double newline for paragraph separation
+    # Split into lines, strip each one once, drop empty/zero-width lines and rejoin
+    lines = (line.strip() for line in selftext.split('\n'))
+    cleaned_text = '\n\n'.join(line for line in lines if line and line != '&#x200B;')  # Use double newline for paragraph separation
     
-    return cleaned_text if cleaned_text.strip() and cleaned_text.strip() != '&#x200B;' else None
+    return cleaned_text or None
 
 # Poll Post Handeling
 async def process_reddit_poll(submission, channel, button_visibility):
@@ -1153,13 +1518,7 @@ async def process_reddit_poll(submission, channel, button_visibility):
     
     # Add author information
     author_name = submission.author.name if submission.author else "[deleted]"
-    author_icon = None
-    if submission.author:
-        try:
-            await submission.author.load()
-            author_icon = submission.author.icon_img
-        except Exception as e:
-            logger.warning(f"Failed to load author icon for {author_name}: {e}")
+    author_icon = await get_author_icon(submission.author)
 
     embed.set_author(name=author_name, icon_url=author_icon)
     embed.set_footer(text=f"r/{submission.subreddit.display_name} | Poll")
@@ -1170,8 +1529,7 @@ async def process_reddit_poll(submission, channel, button_visibility):
         cleaned_text = clean_selftext(submission.selftext)
         if cleaned_text:
             # Remove video URLs from the cleaned text
-            video_url_pattern = r'https://reddit\.com/link/[^/]+/video/[^/]+/player'
-            cleaned_text = re.sub(video_url_pattern, '', cleaned_text).strip()
+            cleaned_text = _REDDIT_VIDEO_PLAYER_RE.sub('', cleaned_text).strip()
             if cleaned_text:
                 embed.description = truncate_string(cleaned_text, 4096)  # Discord embed description limit
 
@@ -1219,7 +1577,7 @@ async def process_reddit_poll(submission, channel, button_visibility):
                 image_url = item['s']['gif'].split('?')[0]  # Remove query parameters
                 image_urls.append(image_url)
             elif item['e'] == 'RedditVideo':
-                video_url_matches = re.findall(r'https://reddit\.com/link/[^/]+/video/[^/]+/player', submission.selftext)
+                video_url_matches = _REDDIT_VIDEO_PLAYER_RE.findall(submission.selftext)
                 video_urls.update(video_url_matches)
 
     if video_urls:
@@ -1227,61 +1585,46 @@ async def process_reddit_poll(submission, channel, button_visibility):
         video_links = "\n".join(video_urls)
         embed.add_field(name="Video Link(s)", value=video_links, inline=False)
         
-        view = discord.ui.View()
-        reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{submission.permalink}", button_visibility)
-        watch_video_button = create_button("Watch Video", next(iter(video_urls)), button_visibility)
-        if reddit_post_button:
-            view.add_item(reddit_post_button)
-        if watch_video_button:
-            view.add_item(watch_video_button)
+        view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{submission.permalink}"), ("Watch Video", next(iter(video_urls))))
         
-        await channel.send(embed=embed, view=view)
+        await send_rate_limited(channel, embed=embed, view=view)
     elif image_urls:
         # Send poll information first
-        await channel.send(embed=embed)
+        await send_rate_limited(channel, embed=embed)
 
         # Process images if any (no changes to this part)
         oversized_gifs = []
         remaining_urls = []
-        async with aiohttp.ClientSession() as session:
-            for url in image_urls:
-                if url.lower().endswith('.gif'):
-                    async with session.head(url) as resp:
-                        if resp.status == 200:
-                            content_length = int(resp.headers.get('Content-Length', 0))
-                            if content_length > MAX_VIDEO_SIZE:
-                                oversized_gifs.append(url)
-                            else:
-                                remaining_urls.append(url)
-                else:
-                    remaining_urls.append(url)
+        session = get_http_session()
+        for url in image_urls:
+            if url.lower().endswith('.gif'):
+                async with session.head(url) as resp:
+                    if resp.status == 200:
+                        content_length = int(resp.headers.get('Content-Length', 0))
+                        if content_length > MAX_VIDEO_SIZE:
+                            oversized_gifs.append(url)
+                        else:
+                            remaining_urls.append(url)
+            else:
+                remaining_urls.append(url)
 
         # Embed oversized GIFs (no changes to this part)
         for i, gif_url in enumerate(oversized_gifs):
             if i == len(oversized_gifs) - 1 and not remaining_urls:
                 # This is the last oversized GIF and there are no remaining images
-                view = discord.ui.View()
-                reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{submission.permalink}", button_visibility)
-                if reddit_post_button:
-                    view.add_item(reddit_post_button)
+                view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{submission.permalink}"))
                 await embed_oversized_gif(channel, None, view, gif_url)
             else:
                 await embed_oversized_gif(channel, None, None, gif_url)
 
         # Send remaining images in carousel with the Reddit Post button (no changes to this part)
         if remaining_urls:
-            image_view = discord.ui.View()
-            image_reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{submission.permalink}", button_visibility)
-            if image_reddit_post_button:
-                image_view.add_item(image_reddit_post_button)
+            image_view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{submission.permalink}"))
             await send_image_carousel(channel, remaining_urls, image_view)
     else:
         # For text-only polls, send everything in one message
-        view = discord.ui.View()
-        reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{submission.permalink}", button_visibility)
-        if reddit_post_button:
-            view.add_item(reddit_post_button)
-        await channel.send(embed=embed, view=view)
+        view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{submission.permalink}"))
+        await send_rate_limited(channel, embed=embed, view=view)
 
     logger.info(f"Processed Reddit Poll: {submission.id}")
 
@@ -1302,8 +1645,9 @@ async def process_submission(submission, channel, button_visibility):
         channel = channel.thread
 
     try:
-        # Ensure the submission is fully loaded
-        await submission.load()
+        # Submissions from a listing already carry every field used below, only lazy ones need the extra request
+        if 'created_utc' not in vars(submission):
+            await submission.load()
     except asyncprawcore.exceptions.RequestException as e:
         logger.error(f"Error loading submission: {e}")
         return  # Exit if we can't load the submission
@@ -1334,16 +1678,7 @@ async def process_submission(submission, channel, button_visibility):
 
     author_name = processing_submission.author.name if processing_submission.author else "[deleted]"
     author_profile_url = f"https://www.reddit.com/user/{author_name}" if processing_submission.author else None
-    
-    try:
-        if processing_submission.author:
-            await processing_submission.author.load()
-            author_icon_url = processing_submission.author.icon_img if hasattr(processing_submission.author, 'icon_img') else None
-        else:
-            author_icon_url = None
-    except Exception as e:
-        logger.info(f"Error fetching author details: {e}")
-        author_icon_url = None
+    author_icon_url = await get_author_icon(processing_submission.author)
     
     embed = discord.Embed(
         title=truncate_string(processing_submission.title, 256),
@@ -1353,10 +1688,8 @@ async def process_submission(submission, channel, button_visibility):
     
     embed.set_author(name=author_name, url=author_profile_url, icon_url=author_icon_url)
 
-    view = discord.ui.View()
-    reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}", button_visibility)
-    if reddit_post_button:
-        view.add_item(reddit_post_button)
+    view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}"))
+    url_kind = classify_url(processing_submission.url)
 
     message_sent = False
     image_urls = []  # Initialize image_urls at the beginning
@@ -1372,25 +1705,25 @@ async def process_submission(submission, channel, button_visibility):
         gallery_items = processing_submission.gallery_data['items']
         image_urls = []
         oversized_gifs = []
-        async with aiohttp.ClientSession() as session:
-            for item in gallery_items:
-                media_id = item['media_id']
-                media_info = processing_submission.media_metadata.get(media_id, {})
+        session = get_http_session()
+        for item in gallery_items:
+            media_id = item['media_id']
+            media_info = processing_submission.media_metadata.get(media_id, {})
+            
+            # Check if 'm' key exists in media_info
+            if 'm' in media_info:
+                image_url = f"https://i.redd.it/{media_id}.{media_info['m'].split('/')[-1]}"
                 
-                # Check if 'm' key exists in media_info
-                if 'm' in media_info:
-                    image_url = f"https://i.redd.it/{media_id}.{media_info['m'].split('/')[-1]}"
-                    
-                    # Check image size and separate GIFs
-                    async with session.head(image_url) as resp:
-                        if resp.status == 200:
-                            content_length = int(resp.headers.get('Content-Length', 0))
-                            if image_url.lower().endswith('.gif') and content_length > MAX_VIDEO_SIZE:
-                                oversized_gifs.append(image_url)
-                            else:
-                                image_urls.append(image_url)
-                else:
-                    logger.warning(f"'m' key not found in media_info for media_id: {media_id}. Skipping this item.")
+                # Check image size and separate GIFs
+                async with session.head(image_url) as resp:
+                    if resp.status == 200:
+                        content_length = int(resp.headers.get('Content-Length', 0))
+                        if image_url.lower().endswith('.gif') and content_length > MAX_VIDEO_SIZE:
+                            oversized_gifs.append(image_url)
+                        else:
+                            image_urls.append(image_url)
+            else:
+                logger.warning(f"'m' key not found in media_info for media_id: {media_id}. Skipping this item.")
 
         image_count = len(gallery_items)
         embed.add_field(name="Image Gallery", value=f"This Reddit Post contains {image_count} image{'s' if image_count != 1 else ''}")
@@ -1398,7 +1731,7 @@ async def process_submission(submission, channel, button_visibility):
 
         # Send the initial message with embed and without buttons
         add_footer_and_crosspost_info(embed, processing_submission, submission, original_post_data if processing_submission != submission else None)
-        await channel.send(embed=embed)
+        await send_rate_limited(channel, embed=embed)
         message_sent = True
 
         # Create a new view for the image message
@@ -1431,7 +1764,7 @@ async def process_submission(submission, channel, button_visibility):
 
         return  # Exit the function after handling the gallery
 
-    elif 'redgifs.com' in processing_submission.url:
+    elif url_kind == 'redgifs':
         fallback_url = None
         if hasattr(processing_submission, 'preview') and 'reddit_video_preview' in processing_submission.preview:
             fallback_url = processing_submission.preview['reddit_video_preview'].get('fallback_url')
@@ -1440,58 +1773,32 @@ async def process_submission(submission, channel, button_visibility):
             fallback_url = fallback_url.split('?')[0]  # Remove anything after .mp4
             video_content = await download_video(fallback_url, MAX_VIDEO_SIZE)
             if video_content:
-                with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as temp_file:
-                    temp_file.write(video_content)
-                    temp_file_path = temp_file.name
-
-                file = discord.File(temp_file_path, filename="redgifs_video.mp4")
+                file = discord.File(io.BytesIO(video_content), filename="redgifs_video.mp4")
                 embed.add_field(name="RedGIFs Video", value=processing_submission.url)
             
                 # Create a new view for the video message
-                video_view = discord.ui.View()
-                reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}", button_visibility)
-                if reddit_post_button:
-                    video_view.add_item(reddit_post_button)
-                redgifs_button = create_button("RedGIFs", processing_submission.url, button_visibility)
-                if redgifs_button:
-                    video_view.add_item(redgifs_button)
+                video_view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}"), ("RedGIFs", processing_submission.url))
             
                 # Send the embed message without buttons
                 add_footer_and_crosspost_info(embed, processing_submission, submission, original_post_data if processing_submission != submission else None)
-                await channel.send(embed=embed)
+                await send_rate_limited(channel, embed=embed)
             
                 # Send the video file with buttons in a separate message
-                await channel.send(file=file, view=video_view)
+                await send_rate_limited(channel, file=file, view=video_view)
             
-                os.unlink(temp_file_path)
                 return  # Exit the function after sending both messages
             else:
                 embed.add_field(name="RedGIFs Link", value=processing_submission.url)
-                redgifs_button = create_button("RedGIFs", processing_submission.url, button_visibility)
-                if redgifs_button:
-                    view.add_item(redgifs_button)
+                add_buttons(view, button_visibility, ("RedGIFs", processing_submission.url))
 
         else:
             embed.add_field(name="RedGIFs Link", value=processing_submission.url)
-            redgifs_button = create_button("RedGIFs", processing_submission.url, button_visibility)
-            if redgifs_button:
-                view.add_item(redgifs_button)
+            add_buttons(view, button_visibility, ("RedGIFs", processing_submission.url))
     elif processing_submission.is_self:
-        print(f"Processing self post: {processing_submission.id}")
+        logger.debug("Processing self post: %s", processing_submission.id)
         
         if processing_submission.selftext:
-            #print(f"Original selftext: {processing_submission.selftext}")
-            
-            # Clean the text while preserving URLs
-            cleaned_text = clean_selftext(processing_submission.selftext)
-            
-            #print(f"Cleaned text: {cleaned_text}")
-            
-            # Set description with the full cleaned text, including URLs
-            if cleaned_text:
-                embed.description = cleaned_text[:4000]
-            
-            # Process images
+            # The cleaned text is already the embed description (set above), so only the images are extracted here
             image_urls = extract_all_images(processing_submission.selftext)
             
             if image_urls:
@@ -1500,63 +1807,54 @@ async def process_submission(submission, channel, button_visibility):
                 else:
                     embed.add_field(name="Reddit Images", value=f"This post contains {len(image_urls)} images.", inline=False)
         
-        print(f"Final embed description: {embed.description}")
+        logger.debug("Final embed description: %s", embed.description)
         
         if not image_urls:
 			# Only add the Reddit Post button for text-only posts
-            view = discord.ui.View()
-            reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}", button_visibility)
-            if reddit_post_button:
-                view.add_item(reddit_post_button)
+            view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}"))
             add_footer_and_crosspost_info(embed, processing_submission, submission, original_post_data if processing_submission != submission else None)
             if hasattr(channel, 'thread'):
-                await channel.thread.send(embed=embed, view=view)
+                await send_rate_limited(channel.thread, embed=embed, view=view)
             else:
-                await channel.send(embed=embed, view=view)
+                await send_rate_limited(channel, embed=embed, view=view)
         else:
             # For posts with images, send the text content without the button
             add_footer_and_crosspost_info(embed, processing_submission, submission, original_post_data if processing_submission != submission else None)
             if hasattr(channel, 'thread'):
-                await channel.thread.send(embed=embed)
+                await send_rate_limited(channel.thread, embed=embed)
             else:
-                await channel.send(embed=embed)
+                await send_rate_limited(channel, embed=embed)
         
         # Process images if any
         if image_urls:
             # Process oversized GIFs and remaining images
             oversized_gifs = []
             remaining_urls = []
-            async with aiohttp.ClientSession() as session:
-                for url in image_urls:
-                    if url.lower().endswith('.gif'):
-                        async with session.head(url) as resp:
-                            if resp.status == 200:
-                                content_length = int(resp.headers.get('Content-Length', 0))
-                                if content_length > MAX_VIDEO_SIZE:
-                                    oversized_gifs.append(url)
-                                else:
-                                    remaining_urls.append(url)
-                    else:
-                        remaining_urls.append(url)
+            session = get_http_session()
+            for url in image_urls:
+                if url.lower().endswith('.gif'):
+                    async with session.head(url) as resp:
+                        if resp.status == 200:
+                            content_length = int(resp.headers.get('Content-Length', 0))
+                            if content_length > MAX_VIDEO_SIZE:
+                                oversized_gifs.append(url)
+                            else:
+                                remaining_urls.append(url)
+                else:
+                    remaining_urls.append(url)
 
             # Embed oversized GIFs
             for i, gif_url in enumerate(oversized_gifs):
                 if i == len(oversized_gifs) - 1 and not remaining_urls:
                     # This is the last oversized GIF and there are no remaining images
-                    view = discord.ui.View()
-                    reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}", button_visibility)
-                    if reddit_post_button:
-                        view.add_item(reddit_post_button)
+                    view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}"))
                     await embed_oversized_gif(channel, None, view, gif_url)
                 else:
                     await embed_oversized_gif(channel, None, None, gif_url)
 
             # Send remaining images in carousel with the Reddit Post button
             if remaining_urls:
-                image_view = discord.ui.View()
-                image_reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}", button_visibility)
-                if image_reddit_post_button:
-                    image_view.add_item(image_reddit_post_button)
+                image_view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}"))
                 await send_image_carousel(channel, remaining_urls, image_view)
 
         return  # Exit the function after handling the post
@@ -1569,37 +1867,24 @@ async def process_submission(submission, channel, button_visibility):
             if reddit_video_url:
                 video_content = await download_video(reddit_video_url, MAX_VIDEO_SIZE)
                 if video_content:
-                    with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as temp_file:
-                        temp_file.write(video_content)
-                        temp_file_path = temp_file.name
-
-                    file = discord.File(temp_file_path, filename="reddit_video.mp4")
+                    file = discord.File(io.BytesIO(video_content), filename="reddit_video.mp4")
                     embed.add_field(name="Reddit Video", value=reddit_video_url)
                     
                     # Create a new view for the video message
-                    video_view = discord.ui.View()
-                    reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}", button_visibility)
-                    if reddit_post_button:
-                        video_view.add_item(reddit_post_button)
-                    watch_video_button = create_button("Watch Video", reddit_video_url, button_visibility)
-                    if watch_video_button:
-                        video_view.add_item(watch_video_button)
+                    video_view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{processing_submission.permalink}"), ("Watch Video", reddit_video_url))
                     
                     # Send the embed message without buttons
                     add_footer_and_crosspost_info(embed, processing_submission, submission, original_post_data if processing_submission != submission else None)
-                    await channel.send(embed=embed)
+                    await send_rate_limited(channel, embed=embed)
                     
                     # Send the video file with buttons in a separate message
-                    await channel.send(file=file, view=video_view)
+                    await send_rate_limited(channel, file=file, view=video_view)
                     
-                    os.unlink(temp_file_path)
                     return  # Exit the function after sending both messages
                 else:
                     embed.add_field(name="Reddit Video", value=reddit_video_url)
                     embed.set_image(url=thumbnail_url if thumbnail_url else reddit_video_url)
-                    watch_video_button = create_button("Watch Video", reddit_video_url, button_visibility)
-                    if watch_video_button:
-                        view.add_item(watch_video_button)            
+                    add_buttons(view, button_visibility, ("Watch Video", reddit_video_url))
                     
                     # Add the new message for large files
                     embed.add_field(name="Note", value="Due to Discord upload limits, you'll need to view this video on Reddit or via the Reddit App using the link provided.", inline=False)
@@ -1610,20 +1895,14 @@ async def process_submission(submission, channel, button_visibility):
                     embed.add_field(name=youtube_title, value=f"https://www.youtube.com/watch?v={youtube_id}")
                     if thumbnail_url:
                         embed.set_image(url=thumbnail_url)
-                    youtube_button = create_button("YouTube Link", f"https://www.youtube.com/watch?v={youtube_id}", button_visibility)
-                    if youtube_button:
-                        view.add_item(youtube_button)
+                    add_buttons(view, button_visibility, ("YouTube Link", f"https://www.youtube.com/watch?v={youtube_id}"))
                 else:
-                    if '/gallery/' in processing_submission.url:
+                    if url_kind == 'gallery':
                         embed.add_field(name="Image Gallery Link", value=processing_submission.url)
-                        gallery_button = create_button("Image Gallery", processing_submission.url, button_visibility)
-                        if gallery_button:
-                            view.add_item(gallery_button)
+                        add_buttons(view, button_visibility, ("Image Gallery", processing_submission.url))
                     else:
                         embed.add_field(name="Link", value=processing_submission.url)
-                        web_link_button = create_button("Web Link", processing_submission.url, button_visibility)
-                        if web_link_button:
-                            view.add_item(web_link_button)
+                        add_buttons(view, button_visibility, ("Web Link", processing_submission.url))
 
     # Send the message only if it hasn't been sent already
     if not message_sent:
@@ -1641,23 +1920,27 @@ async def process_submission(submission, channel, button_visibility):
             if crosspost_field:
                 embed.add_field(name=crosspost_field.name, value=crosspost_field.value, inline=False)
 
-        print(f"Final Embed data before sending for submission {processing_submission.id}: {embed.to_dict()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Final Embed data before sending for submission %s: %s", processing_submission.id, embed.to_dict())
         if hasattr(channel, 'thread'):
-            await channel.thread.send(embed=embed, view=view)
+            await send_rate_limited(channel.thread, embed=embed, view=view)
         else:
-            await channel.send(embed=embed, view=view)
+            await send_rate_limited(channel, embed=embed, view=view)
 
     logger.debug(f"Image set: {bool(embed.image)}")
     logger.debug(f"Embed image URL: {embed.image.url if embed.image else 'No image set'}")
 
-async def process_forum_subscription(reddit, subreddit, channel_id, thread_id, last_check, last_submission_id):
+FORUM_SUBSCRIPTION_STATE_UPDATE = "UPDATE forum_subscriptions SET last_check_ts = ?, last_submission_id = ? WHERE subreddit = ? AND channel_id = ?"
+INDIVIDUAL_FORUM_SUBSCRIPTION_STATE_UPDATE = "UPDATE individual_forum_subscriptions SET last_check_ts = ? WHERE subreddit = ? AND channel_id = ?"
+
+async def process_forum_subscription(reddit, subreddit, channel_id, thread_id, last_check_ts, last_submission_id, pending_updates=None):
+    # When pending_updates is given the new state is appended to it for the caller to write in one batch
     forum_channel = bot.get_channel(channel_id)
     if forum_channel:
         try:
             await sync_forum_tags_function(forum_channel)
             subreddit_obj = await reddit.subreddit(subreddit)
-            last_check_dt = datetime.fromisoformat(last_check).replace(tzinfo=timezone.utc)
-            new_submissions = await fetch_new_submissions(subreddit_obj, last_check_dt, limit=10)
+            new_submissions = await fetch_new_submissions(subreddit_obj, last_check_ts)
             
             if channel_id not in processed_submissions:
                 processed_submissions[channel_id] = set()
@@ -1693,10 +1976,11 @@ async def process_forum_subscription(reddit, subreddit, channel_id, thread_id, l
                         logger.info(f"Skipping already processed submission {submission.id} for channel {channel_id}")
             
             if new_submissions:
-                new_last_check = datetime.now(timezone.utc).isoformat()
-                c.execute("UPDATE forum_subscriptions SET last_check = ?, last_submission_id = ? WHERE subreddit = ? AND channel_id = ?",
-                          (new_last_check, new_submissions[0].id, subreddit, channel_id))
-                conn.commit()
+                update = (int(time.time()), new_submissions[0].id, subreddit, channel_id)
+                if pending_updates is not None:
+                    pending_updates.append(update)
+                else:
+                    await db_execute(FORUM_SUBSCRIPTION_STATE_UPDATE, update)
         except Exception as e:
             # Check if the error is a known issue (like a 500 HTTP response)
             if "500" in str(e):
@@ -1704,7 +1988,7 @@ async def process_forum_subscription(reddit, subreddit, channel_id, thread_id, l
             else:
                 logger.error(f"Error processing forum subscription for r/{subreddit}: {str(e)}", exc_info=False)
 
-async def process_individual_forum_subscription(reddit, subreddit, channel_id, last_check):
+async def process_individual_forum_subscription(reddit, subreddit, channel_id, last_check_ts, pending_updates=None):
     forum_channel = bot.get_channel(channel_id)
     if forum_channel is None:
         logger.warning(f"Forum not found: {channel_id}")
@@ -1713,8 +1997,7 @@ async def process_individual_forum_subscription(reddit, subreddit, channel_id, l
     try:
         await sync_forum_tags_function(forum_channel)
         subreddit_obj = await reddit.subreddit(subreddit)
-        last_check_dt = datetime.fromisoformat(last_check).replace(tzinfo=timezone.utc)
-        new_submissions = await fetch_new_submissions(subreddit_obj, last_check_dt, limit=10)
+        new_submissions = await fetch_new_submissions(subreddit_obj, last_check_ts)
         
         if channel_id not in processed_submissions:
             processed_submissions[channel_id] = set()
@@ -1754,10 +2037,11 @@ async def process_individual_forum_subscription(reddit, subreddit, channel_id, l
                 logger.info(f"Skipping already processed submission {submission.id} for channel {channel_id}")
         
         if new_submissions:
-            new_last_check = datetime.now(timezone.utc).isoformat()
-            c.execute("UPDATE individual_forum_subscriptions SET last_check = ? WHERE subreddit = ? AND channel_id = ?",
-                      (new_last_check, subreddit, channel_id))
-            conn.commit()
+            update = (int(time.time()), subreddit, channel_id)
+            if pending_updates is not None:
+                pending_updates.append(update)
+            else:
+                await db_execute(INDIVIDUAL_FORUM_SUBSCRIPTION_STATE_UPDATE, update)
         else:
             logger.info(f"No new submissions found for r/{subreddit}")
 
@@ -1771,90 +2055,79 @@ async def process_individual_forum_subscription(reddit, subreddit, channel_id, l
     except Exception as e:
         logger.exception(f"Error processing individual forum subscription for {subreddit}: {str(e)}")
 
-async def update_tracking(subreddit, channel_id, last_check, last_submission_id):
-    c.execute('''INSERT OR REPLACE INTO submission_tracking 
-                 (subreddit, channel_id, last_check, last_submission_id) 
-                 VALUES (?, ?, ?, ?)''', 
-              (subreddit, channel_id, last_check.strftime("%Y-%m-%d %H:%M:%S.%f"), last_submission_id))
-    conn.commit()
+async def update_tracking(subreddit, channel_id, last_check_ts, last_submission_id):
+    with conn:
+        c.execute('''INSERT OR REPLACE INTO submission_tracking 
+                     (subreddit, channel_id, last_check_ts, last_submission_id) 
+                     VALUES (?, ?, ?, ?)''', 
+                  (subreddit, channel_id, last_check_ts, last_submission_id))
 
 async def get_tracking(subreddit, channel_id):
-    c.execute('''SELECT last_check, last_submission_id FROM submission_tracking 
+    c.execute('''SELECT last_check_ts, last_submission_id FROM submission_tracking 
                  WHERE subreddit = ? AND channel_id = ?''', 
               (subreddit, channel_id))
     result = c.fetchone()
     if result:
-        return datetime.strptime(result[0], "%Y-%m-%d %H:%M:%S.%f").replace(tzinfo=timezone.utc), result[1]
-    return datetime.now(timezone.utc), None
+        return result[0], result[1]
+    return int(time.time()), None
 
 async def download_video(url, max_size):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status == 200:
-                content = await response.read()
-                if len(content) <= max_size:
-                    return content
-    return None
+    async with get_http_session().get(url) as response:
+        if response.status != 200:
+            return None
+        # Reject oversized videos from the headers before transferring the body
+        if response.content_length and response.content_length > max_size:
+            logger.debug(f"Skipping video download, Content-Length exceeds {max_size} bytes: {url}")
+            return None
+        content = bytearray()
+        async for chunk in response.content.iter_chunked(65536):
+            content.extend(chunk)
+            if len(content) > max_size:
+                logger.debug(f"Aborted video download after exceeding {max_size} bytes: {url}")
+                return None
+        return bytes(content)
 
 async def process_reddit_video(submission, channel, button_visibility):
     if (hasattr(submission, 'media_metadata') and 
         any(item.get('e') == 'RedditVideo' for item in submission.media_metadata.values())):
         
-        video_url_matches = re.findall(r'https://reddit\.com/link/[^/]+/video/[^/]+/player', submission.selftext)
+        video_url_matches = _REDDIT_VIDEO_PLAYER_RE.findall(submission.selftext)
         
         if video_url_matches:
             primary_video_url = video_url_matches[0]
             
-            embed = discord.Embed(
-                title=truncate_string(submission.title, 256),
-                url=f"https://www.reddit.com{submission.permalink}",
-                color=discord.Color.green()
-            )
-            
             author_name = submission.author.name if submission.author else "[deleted]"
             author_profile_url = f"https://www.reddit.com/user/{author_name}" if submission.author else None
-            author_icon_url = None
-            if submission.author:
-                try:
-                    await submission.author.load()
-                    author_icon_url = submission.author.icon_img
-                except Exception as e:
-                    print(f"Error fetching author details: {e}")
-            embed.set_author(name=author_name, url=author_profile_url, icon_url=author_icon_url)
+            author_icon_url = await get_author_icon(submission.author)
+            
+            # The embed always has the same shape, so it is built as a dict in one go rather than through the setters
+            embed_data = {
+                'title': truncate_string(submission.title, 256),
+                'url': f"https://www.reddit.com{submission.permalink}",
+                'color': discord.Color.green().value,
+                'author': {key: value for key, value in (('name', author_name), ('url', author_profile_url), ('icon_url', author_icon_url)) if value is not None},
+                'fields': [
+                    {'name': "Reddit Video", 'value': "This type of Reddit video(s) can only be viewed online or via the Reddit App.", 'inline': False},
+                    {'name': "Video Link(s)", 'value': "\n".join(video_url_matches), 'inline': False},
+                ],
+                'footer': {'text': f"r/{submission.subreddit.display_name}"},
+                'timestamp': datetime.fromtimestamp(submission.created_utc, tz=timezone.utc).isoformat(),
+            }
             
             if submission.selftext:
                 cleaned_text = clean_video_post_text(submission.selftext, video_url_matches)
                 if cleaned_text and cleaned_text.strip() != '&#x200B;':
-                    embed.description = cleaned_text[:4000]
-            
-            embed.add_field(name="Reddit Video", value="This type of Reddit video(s) can only be viewed online or via the Reddit App.", inline=False)
-            
-            video_links = "\n".join(video_url_matches)
-            embed.add_field(name="Video Link(s)", value=video_links, inline=False)
-            
-            embed.set_footer(text=f"r/{submission.subreddit.display_name}")
-            embed.timestamp = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
-            
-            view = discord.ui.View()
+                    embed_data['description'] = cleaned_text[:4000]
             
-            reddit_post_button = create_button("Reddit Post", f"https://www.reddit.com{submission.permalink}", button_visibility)
-            if reddit_post_button:
-                view.add_item(reddit_post_button)
-            
-            watch_video_button = create_button("Watch Video", primary_video_url, button_visibility)
-            if watch_video_button:
-                view.add_item(watch_video_button)
-            
-            # Final check before sending
-            if embed.description == '&#x200B;':
-                embed.description = None
+            embed = discord.Embed.from_dict(embed_data)
+            view = create_view(button_visibility, ("Reddit Post", f"https://www.reddit.com{submission.permalink}"), ("Watch Video", primary_video_url))
             
             if hasattr(channel, 'send'):
-                await channel.send(embed=embed, view=view)
+                await send_rate_limited(channel, embed=embed, view=view)
             elif hasattr(channel, 'thread'):
-                await channel.thread.send(embed=embed, view=view)
+                await send_rate_limited(channel.thread, embed=embed, view=view)
             else:
-                print(f"Unexpected channel type: {type(channel)}")
+                logger.warning("Unexpected channel type: %s", type(channel))
                 return False
             
             return True
@@ -1862,40 +2135,49 @@ async def process_reddit_video(submission, channel, button_visibility):
     return False  # Indicate that this submission wasn't handled by this function
 
 async def embed_oversized_gif(channel, embed, view, gif_url):
-    print(f"Embedding oversized GIF: {gif_url}")
+    logger.debug("Embedding oversized GIF: %s", gif_url)
     new_embed = discord.Embed(color=discord.Color.green())
     new_embed.set_image(url=gif_url)
     try:
-        await channel.send(embed=new_embed, view=view)
-        print("Successfully sent oversized GIF embed")
+        await send_rate_limited(channel, embed=new_embed, view=view)
+        logger.debug("Successfully sent oversized GIF embed")
         return True
     except discord.HTTPException:
-        print("Failed to embed GIF, adding link to embed")
+        logger.debug("Failed to embed GIF, adding link to embed")
         new_embed.add_field(name="Oversized GIF", value=f"This GIF may have exceeded the upload size limit, but should be viewable via this link if the direct embed does not work:\n{gif_url}", inline=False)
-        await channel.send(embed=new_embed, view=view)
+        await send_rate_limited(channel, embed=new_embed, view=view)
         return True
     return False
 
-async def process_subscription(reddit, subreddit, channel_id, last_check, last_submission_id):
+SUBSCRIPTION_STATE_UPDATE = "UPDATE subscriptions SET last_check_ts = ?, last_submission_id = ? WHERE subreddit = ? AND channel_id = ?"
+
+async def process_subscription(reddit, subreddit, channel_id, last_check_ts, last_submission_id, pending_updates=None, fetched_submissions=None):
+    # When pending_updates is given the new state is appended to it for the caller to write in one batch.
+    # fetched_submissions (newest first) is a listing already fetched for this subreddit, filtered here by last_check_ts.
+    # Returns the new submissions found (possibly none), or None if the subreddit could not be checked
     channel = bot.get_channel(channel_id)
-    processed_ids = set()
+    new_submissions = None
     if channel:
         try:
-            subreddit_obj = await reddit.subreddit(subreddit)
-            last_check_dt = datetime.fromisoformat(last_check).replace(tzinfo=timezone.utc)
-            new_submissions = await fetch_new_submissions(subreddit_obj, last_check_dt, limit=10)
+            if fetched_submissions is None:
+                subreddit_obj = await reddit.subreddit(subreddit)
+                new_submissions = await fetch_new_submissions(subreddit_obj, last_check_ts)
+            else:
+                new_submissions = list(itertools.takewhile(lambda submission: submission.created_utc > last_check_ts, fetched_submissions))
             
             if channel_id not in processed_submissions:
                 processed_submissions[channel_id] = set()
             
+            # Flair settings are read once per subscription rather than once per new submission
+            if new_submissions:
+                max_flairs, flair_enabled, blacklisted_flairs = await get_flair_settings(channel_id)
+            
             for submission in reversed(new_submissions):
                 if submission.id not in processed_submissions[channel_id]:
                     processed_submissions[channel_id].add(submission.id)
-                    processed_ids.add(submission.id)
                     logger.info(f"Processing submission {submission.id} with flair '{submission.link_flair_text}' for subreddit {subreddit}")
                     
                     # Log flair settings before processing
-                    max_flairs, flair_enabled, blacklisted_flairs = get_flair_settings(channel_id)
                     logger.info(f"Current flair settings for channel {channel_id}: max_flairs={max_flairs}, flair_enabled={flair_enabled}, blacklisted_flairs={blacklisted_flairs}")
                     
                     await process_submission(submission, channel, get_button_visibility())
@@ -1903,13 +2185,17 @@ async def process_subscription(reddit, subreddit, channel_id, last_check, last_s
                     logger.info(f"Skipping already processed submission {submission.id} for subreddit {subreddit}")
             
             if new_submissions:
-                new_last_check = datetime.now(timezone.utc).isoformat()
-                c.execute("UPDATE subscriptions SET last_check = ?, last_submission_id = ? WHERE subreddit = ? AND channel_id = ?",
-                          (new_last_check, new_submissions[0].id, subreddit, channel_id))
-                conn.commit()
+                new_last_check_ts = int(time.time())
+                update = (new_last_check_ts, new_submissions[0].id, subreddit, channel_id)
+                if pending_updates is not None:
+                    pending_updates.append(update)
+                else:
+                    await db_execute(SUBSCRIPTION_STATE_UPDATE, update)
+                    update_subscription_cache([update])
         except Exception as e:
-            print(f"Error processing subreddit {subreddit}: {e}")
-    return processed_ids
+            logger.error("Error processing subreddit %s: %s", subreddit, e)
+            return None
+    return new_submissions
 
 # 10. Database Management Functions
 # ================================
@@ -1933,7 +2219,7 @@ async def check_flair_settings(interaction: discord.Interaction, forum: discord.
     await interaction.response.defer(ephemeral=True)
     
     try:
-        max_flairs, flair_enabled, blacklisted_flairs = get_flair_settings(forum.id)
+        max_flairs, flair_enabled, blacklisted_flairs = await get_flair_settings(forum.id)
         
         response = f"Current flair settings for {forum.name}:\n"
         response += f"Flair-to-tag conversion: {'Enabled' if flair_enabled else 'Disabled'}\n"
@@ -1993,10 +2279,7 @@ async def remove_forum_tag(interaction: discord.Interaction, forum: discord.Foru
 
     # Remove the tag from the database
     try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            c.execute("DELETE FROM forum_tags WHERE channel_id = ? AND tag_name = ?", (forum.id, tag_name))
-            conn.commit()
+        await db_execute("DELETE FROM forum_tags WHERE channel_id = ? AND tag_name = ?", (forum.id, tag_name))
         logger.info(f"Removed tag '{tag_name}' from database for forum {forum.name} ({forum.id})")
     except Exception as e:
         logger.error(f"Database error while removing tag '{tag_name}' for forum {forum.name} ({forum.id}): {str(e)}", exc_info=True)
@@ -2757,30 +3040,29 @@ async def subscribe(interaction: discord.Interaction, subreddit: str, channel: d
 
     try:
         # Validate the subreddit
-        async with aiohttp.ClientSession() as session:
-            reddit = asyncpraw.Reddit(
-                client_id=REDDIT_CLIENT_ID,
-                client_secret=REDDIT_CLIENT_SECRET,
-                user_agent=REDDIT_USER_AGENT,
-                requestor_kwargs={'session': session}
-            )
-            
-            if not await is_valid_subreddit(reddit, subreddit):
-                await interaction.followup.send(f"The subreddit r/{subreddit} does not exist or is not accessible. Please check the spelling and try again.", ephemeral=True)
-                return
+        session = get_http_session()
+        reddit = asyncpraw.Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_CLIENT_SECRET,
+            user_agent=REDDIT_USER_AGENT,
+            requestor_kwargs={'session': session}
+        )
+        
+        if not await is_valid_subreddit(reddit, subreddit):
+            await interaction.followup.send(f"The subreddit r/{subreddit} does not exist or is not accessible. Please check the spelling and try again.", ephemeral=True)
+            return
 
-        c.execute("SELECT * FROM subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, channel.id))
-        existing_subscription = c.fetchone()
+        current_time = int(time.time())
+        logger.debug(f"Inserting new subscription: r/{subreddit}, channel {channel.id}, last_check_ts {current_time}")
+        # idx_sub_chan makes an existing (subreddit, channel_id) pair a no-op, so rowcount tells us whether it was new
+        inserted = await db_execute("INSERT OR IGNORE INTO subscriptions (subreddit, channel_id, last_check_ts, last_submission_id) VALUES (?, ?, ?, ?)",
+                                    (subreddit, channel.id, current_time, None))
 
-        if existing_subscription:
+        if not inserted:
             logger.info(f"Subscription to r/{subreddit} in channel {channel.id} already exists")
             await interaction.followup.send(f"Already subscribed to r/{subreddit} in {channel.mention}")
         else:
-            current_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
-            logger.debug(f"Inserting new subscription: r/{subreddit}, channel {channel.id}, last_check {current_time}")
-            c.execute("INSERT INTO subscriptions (subreddit, channel_id, last_check, last_submission_id) VALUES (?, ?, ?, ?)",
-                      (subreddit, channel.id, current_time, None))
-            conn.commit()
+            invalidate_subscription_cache()
             logger.info(f"Successfully subscribed to r/{subreddit} in channel {channel.id}")
             await interaction.followup.send(f"Subscribed to r/{subreddit} in {channel.mention}")
 
@@ -2812,10 +3094,10 @@ async def unsubscribe(interaction: discord.Interaction, subreddit: str, channel:
     
     try:
         logger.debug(f"Executing DELETE query for r/{subreddit} in channel {channel.id}")
-        c.execute("DELETE FROM subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, channel.id))
+        deleted = await db_execute("DELETE FROM subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, channel.id))
         
-        if c.rowcount > 0:
-            conn.commit()
+        if deleted > 0:
+            invalidate_subscription_cache()
             logger.info(f"Successfully unsubscribed from r/{subreddit} in channel {channel.id}")
             await interaction.followup.send(f"Unsubscribed from r/{subreddit} in {channel.mention}")
         else:
@@ -2846,8 +3128,7 @@ async def list_subscriptions(interaction: discord.Interaction):
 
     try:
         logger.debug("Executing SELECT query to fetch all subscriptions")
-        c.execute("SELECT subreddit, channel_id FROM subscriptions ORDER BY channel_id, subreddit")
-        subscriptions = c.fetchall()
+        subscriptions = await db_fetchall("SELECT subreddit, channel_id FROM subscriptions ORDER BY channel_id, subreddit")
         
         if not subscriptions:
             logger.info("No subscriptions found")
@@ -2855,7 +3136,7 @@ async def list_subscriptions(interaction: discord.Interaction):
             return
 
         logger.info(f"Found {len(subscriptions)} subscriptions")
-        response = "Subreddit subscriptions:\n\n"
+        parts = ["Subreddit subscriptions:\n\n"]
         current_channel = None
         subscription_count = 0
 
@@ -2863,23 +3144,19 @@ async def list_subscriptions(interaction: discord.Interaction):
             channel = bot.get_channel(channel_id)
             if channel:
                 if channel != current_channel:
-                    response += f"#{channel.name}:\n"
+                    parts.append(f"#{channel.name}:\n")
                     current_channel = channel
-                response += f"- r/{subreddit}\n"
+                parts.append(f"- r/{subreddit}\n")
                 subscription_count += 1
 
         logger.debug(f"Generated response with {subscription_count} valid subscriptions")
 
-        # If the response is too long, split it into multiple messages
-        if len(response) > 2000:
-            chunks = [response[i:i+2000] for i in range(0, len(response), 2000)]
-            logger.debug(f"Response split into {len(chunks)} chunks")
-            for i, chunk in enumerate(chunks, 1):
-                await interaction.followup.send(chunk)
-                logger.debug(f"Sent chunk {i} of {len(chunks)}")
-        else:
-            await interaction.followup.send(response)
-            logger.debug("Sent single response message")
+        # Pack whole lines into as few messages as possible, so no entry is split across two messages
+        chunks = pack_lines(parts)
+        logger.debug(f"Response packed into {len(chunks)} message(s)")
+        for i, chunk in enumerate(chunks, 1):
+            await interaction.followup.send(chunk)
+            logger.debug(f"Sent chunk {i} of {len(chunks)}")
 
     except sqlite3.Error as e:
         error_message = f"SQLite error occurred while listing subscriptions: {str(e)}"
@@ -2920,17 +3197,17 @@ async def subscribe_forum(
     
     try:
         # Validate the subreddit
-        async with aiohttp.ClientSession() as session:
-            reddit = asyncpraw.Reddit(
-                client_id=REDDIT_CLIENT_ID,
-                client_secret=REDDIT_CLIENT_SECRET,
-                user_agent=REDDIT_USER_AGENT,
-                requestor_kwargs={'session': session}
-            )
-            
-            if not await is_valid_subreddit(reddit, subreddit):
-                await interaction.followup.send(f"The subreddit r/{subreddit} does not exist or is not accessible. Please check the spelling and try again.", ephemeral=True)
-                return
+        session = get_http_session()
+        reddit = asyncpraw.Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_CLIENT_SECRET,
+            user_agent=REDDIT_USER_AGENT,
+            requestor_kwargs={'session': session}
+        )
+        
+        if not await is_valid_subreddit(reddit, subreddit):
+            await interaction.followup.send(f"The subreddit r/{subreddit} does not exist or is not accessible. Please check the spelling and try again.", ephemeral=True)
+            return
 
         if not isinstance(forum, discord.ForumChannel):
             logger.warning(f"User specified a non-forum channel: {forum.name} ({forum.id})")
@@ -2954,15 +3231,16 @@ async def subscribe_forum(
         blacklisted_flairs_list = [flair.strip() for flair in blacklisted_flairs.split(',') if flair.strip()]
         logger.debug(f"Blacklisted flairs: {blacklisted_flairs_list}")
 
-        logger.debug(f"Inserting forum subscription for r/{subreddit} in channel {forum.id}, thread {thread_id}")
-        c.execute("INSERT INTO forum_subscriptions (subreddit, channel_id, thread_id, last_check) VALUES (?, ?, ?, ?)",
-                  (subreddit, forum.id, thread_id, datetime.now(timezone.utc).isoformat()))
-        
-        logger.debug(f"Inserting/updating forum flair settings for r/{subreddit} in channel {forum.id}")
-        c.execute("INSERT OR REPLACE INTO forum_flair_settings (subreddit, channel_id, max_flairs, flair_enabled, blacklisted_flairs) VALUES (?, ?, ?, ?, ?)",
-                  (subreddit, forum.id, max_flairs, int(enable_flairs), json.dumps(blacklisted_flairs_list)))
+        # `with conn:` commits both rows together, or rolls back (e.g. on a duplicate subscription) so no write lock is left behind
+        with conn:
+            logger.debug(f"Inserting forum subscription for r/{subreddit} in channel {forum.id}, thread {thread_id}")
+            c.execute("INSERT INTO forum_subscriptions (subreddit, channel_id, thread_id, last_check_ts) VALUES (?, ?, ?, ?)",
+                      (subreddit, forum.id, thread_id, int(time.time())))
+            
+            logger.debug(f"Inserting/updating forum flair settings for r/{subreddit} in channel {forum.id}")
+            c.execute("INSERT OR REPLACE INTO forum_flair_settings (subreddit, channel_id, max_flairs, flair_enabled, blacklisted_flairs) VALUES (?, ?, ?, ?, ?)",
+                      (subreddit, forum.id, max_flairs, int(enable_flairs), json.dumps(blacklisted_flairs_list)))
         
-        conn.commit()
         logger.info(f"Successfully subscribed forum to r/{subreddit} in channel {forum.id}, thread {thread_id}")
         await interaction.followup.send(f"Successfully subscribed to r/{subreddit} in the specified forum thread.", ephemeral=True)
     
@@ -3014,11 +3292,11 @@ async def unsubscribe_forum(interaction: discord.Interaction, subreddit: str, fo
                 return
 
         logger.debug(f"Executing DELETE query for r/{subreddit} in forum {forum.id}, thread {thread.id}")
-        c.execute("DELETE FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ? AND thread_id = ?", 
-                  (subreddit, forum.id, thread.id))
+        with conn:
+            c.execute("DELETE FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ? AND thread_id = ?", 
+                      (subreddit, forum.id, thread.id))
         
         if c.rowcount > 0:
-            conn.commit()
             logger.info(f"Successfully unsubscribed forum from r/{subreddit} in forum {forum.id}, thread {thread.id}")
             await interaction.followup.send(f"Unsubscribed from r/{subreddit} in thread {thread.mention}")
         else:
@@ -3029,8 +3307,8 @@ async def unsubscribe_forum(interaction: discord.Interaction, subreddit: str, fo
         c.execute("SELECT COUNT(*) FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
         if c.fetchone()[0] == 0:
             logger.debug(f"Cleaning up forum_flair_settings for r/{subreddit} in forum {forum.id}")
-            c.execute("DELETE FROM forum_flair_settings WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
-            conn.commit()
+            with conn:
+                c.execute("DELETE FROM forum_flair_settings WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
     
     except sqlite3.Error as e:
         error_message = f"SQLite error occurred while unsubscribing forum from r/{subreddit}: {str(e)}"
@@ -3070,8 +3348,8 @@ async def unsubscribe_forum_individual(interaction: discord.Interaction, subredd
 
         # Remove the subscription from the database
         logger.debug(f"Executing DELETE query for r/{subreddit} in forum {forum.id}")
-        c.execute("DELETE FROM individual_forum_subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
-        conn.commit()
+        with conn:
+            c.execute("DELETE FROM individual_forum_subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
         
         logger.info(f"Successfully unsubscribed individual forum posts from r/{subreddit} in forum {forum.id}")
         await interaction.followup.send(f"Unsubscribed from r/{subreddit} in {forum.mention} for individual posts.")
@@ -3080,8 +3358,8 @@ async def unsubscribe_forum_individual(interaction: discord.Interaction, subredd
         c.execute("SELECT COUNT(*) FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
         if c.fetchone()[0] == 0:
             logger.debug(f"Cleaning up forum_flair_settings for r/{subreddit} in forum {forum.id}")
-            c.execute("DELETE FROM forum_flair_settings WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
-            conn.commit()
+            with conn:
+                c.execute("DELETE FROM forum_flair_settings WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
     
     except sqlite3.Error as e:
         error_message = f"SQLite error occurred while unsubscribing individual forum posts from r/{subreddit}: {str(e)}"
@@ -3161,16 +3439,12 @@ async def list_forum_subscriptions(interaction: discord.Interaction):
                 else:
                     logger.warning(f"Unable to find forum {channel_id} for individual subscription to r/{subreddit}")
 
-        # If the response is too long, split it into multiple messages
-        if len(response) > 2000:
-            chunks = [response[i:i+2000] for i in range(0, len(response), 2000)]
-            logger.debug(f"Response split into {len(chunks)} chunks")
-            for i, chunk in enumerate(chunks, 1):
-                await interaction.followup.send(chunk)
-                logger.debug(f"Sent chunk {i} of {len(chunks)}")
-        else:
-            await interaction.followup.send(response)
-            logger.debug("Sent single response message")
+        # Pack whole lines into as few messages as possible, so no entry is split across two messages
+        chunks = pack_lines(response.splitlines(keepends=True))
+        logger.debug(f"Response packed into {len(chunks)} message(s)")
+        for i, chunk in enumerate(chunks, 1):
+            await interaction.followup.send(chunk)
+            logger.debug(f"Sent chunk {i} of {len(chunks)}")
 
     except sqlite3.Error as e:
         error_message = f"SQLite error occurred while listing forum subscriptions: {str(e)}"
@@ -3234,8 +3508,8 @@ async def subscribe_forum_create(
             
             if existing_thread is None:
                 logger.warning(f"Previous thread for r/{subreddit} in forum {forum.id} was deleted. Removing old subscription.")
-                c.execute("DELETE FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
-                conn.commit()
+                with conn:
+                    c.execute("DELETE FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
                 await interaction.followup.send(f"The previous thread for r/{subreddit} was deleted. Creating a new one.")
             else:
                 logger.info(f"Subscription already exists for r/{subreddit} in thread {existing_thread.id}")
@@ -3280,13 +3554,13 @@ async def subscribe_forum_create(
         # Add the subscription to the database
         logger.debug(f"Adding subscription for r/{subreddit} to database")
         try:
-            c.execute("INSERT INTO forum_subscriptions (subreddit, channel_id, thread_id, last_check, last_submission_id) VALUES (?, ?, ?, ?, ?)",
-                      (subreddit, forum.id, thread.id, datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f"), latest_post.id))
-            
-            c.execute("INSERT OR REPLACE INTO forum_flair_settings (subreddit, channel_id, max_flairs, flair_enabled, blacklisted_flairs) VALUES (?, ?, ?, ?, ?)",
-                      (subreddit, forum.id, max_flairs, int(enable_flairs), json.dumps(blacklisted_flairs_list)))
+            with conn:
+                c.execute("INSERT INTO forum_subscriptions (subreddit, channel_id, thread_id, last_check_ts, last_submission_id) VALUES (?, ?, ?, ?, ?)",
+                          (subreddit, forum.id, thread.id, int(time.time()), latest_post.id))
+                
+                c.execute("INSERT OR REPLACE INTO forum_flair_settings (subreddit, channel_id, max_flairs, flair_enabled, blacklisted_flairs) VALUES (?, ?, ?, ?, ?)",
+                          (subreddit, forum.id, max_flairs, int(enable_flairs), json.dumps(blacklisted_flairs_list)))
             
-            conn.commit()
             logger.info(f"Successfully added subscription for r/{subreddit} in thread {thread.id}")
         except sqlite3.Error as e:
             logger.error(f"SQLite error while saving subscription for r/{subreddit}: {str(e)}", exc_info=True)
@@ -3344,14 +3618,6 @@ async def subscribe_forum_individual(
             await interaction.followup.send(f"The subreddit r/{subreddit} does not exist or is not accessible. Please check the spelling and try again.", ephemeral=True)
             return
 
-        # Check if a subscription already exists
-        logger.debug(f"Checking for existing subscription for r/{subreddit} in forum {forum.id}")
-        c.execute("SELECT * FROM individual_forum_subscriptions WHERE subreddit = ? AND channel_id = ?", (subreddit, forum.id))
-        if c.fetchone():
-            logger.info(f"Subscription already exists for r/{subreddit} in forum {forum.id}")
-            await interaction.followup.send(f"Already subscribed to r/{subreddit} in {forum.mention} for individual posts")
-            return
-
         # Convert blacklisted_flairs to a list and remove any leading/trailing whitespace
         blacklisted_flairs_list = [flair.strip() for flair in blacklisted_flairs.split(',') if flair.strip()]
         logger.debug(f"Blacklisted flairs for r/{subreddit}: {blacklisted_flairs_list}")
@@ -3359,15 +3625,21 @@ async def subscribe_forum_individual(
         # Add the subscription to the database
         logger.debug(f"Adding subscription for r/{subreddit} to database")
         try:
-            c.execute("INSERT INTO individual_forum_subscriptions (subreddit, channel_id, last_check) VALUES (?, ?, ?)",
-                      (subreddit, forum.id, datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")))
-            
-            # Add flair settings to the database
-            logger.debug(f"Attempting to insert into forum_flair_settings: subreddit={subreddit}, channel_id={forum.id}, max_flairs={max_flairs}, flair_enabled={int(enable_flairs)}, blacklisted_flairs={json.dumps(blacklisted_flairs_list)}")
-            c.execute("INSERT OR REPLACE INTO forum_flair_settings (subreddit, channel_id, max_flairs, flair_enabled, blacklisted_flairs) VALUES (?, ?, ?, ?, ?)",
-                      (subreddit, forum.id, max_flairs, int(enable_flairs), json.dumps(blacklisted_flairs_list)))
+            with conn:
+                # idx_individual_forum_sub_chan makes an existing (subreddit, channel_id) pair a no-op, so rowcount tells us whether it was new
+                c.execute("INSERT OR IGNORE INTO individual_forum_subscriptions (subreddit, channel_id, last_check_ts) VALUES (?, ?, ?)",
+                          (subreddit, forum.id, int(time.time())))
+                inserted = c.rowcount > 0
+                if inserted:
+                    # Add flair settings to the database
+                    logger.debug(f"Attempting to insert into forum_flair_settings: subreddit={subreddit}, channel_id={forum.id}, max_flairs={max_flairs}, flair_enabled={int(enable_flairs)}, blacklisted_flairs={json.dumps(blacklisted_flairs_list)}")
+                    c.execute("INSERT OR REPLACE INTO forum_flair_settings (subreddit, channel_id, max_flairs, flair_enabled, blacklisted_flairs) VALUES (?, ?, ?, ?, ?)",
+                              (subreddit, forum.id, max_flairs, int(enable_flairs), json.dumps(blacklisted_flairs_list)))
+            if not inserted:
+                logger.info(f"Subscription already exists for r/{subreddit} in forum {forum.id}")
+                await interaction.followup.send(f"Already subscribed to r/{subreddit} in {forum.mention} for individual posts")
+                return
             
-            conn.commit()
             logger.info(f"Successfully added subscription for r/{subreddit} in forum {forum.id}")
             await interaction.followup.send(f"Subscribed to r/{subreddit} in {forum.mention}. Each new post will create a separate thread.")
         except sqlite3.Error as e:
@@ -3438,17 +3710,17 @@ async def set_button_visibility(interaction: discord.Interaction, button: app_co
     try:
         if button.value == "all":
             logger.debug("Updating visibility for all buttons")
-            for btn in button_list:
-                c.execute("UPDATE button_visibility SET is_visible = ? WHERE button_name = ?", (int(visible), btn))
-                logger.debug(f"Updated visibility for button '{btn}' to {visible}")
+            await db_execute("UPDATE button_visibility SET is_visible = ?", (int(visible),))
             message = f"All buttons are now {'visible' if visible else 'hidden'}."
         else:
             logger.debug(f"Updating visibility for button '{button.value}'")
-            c.execute("UPDATE button_visibility SET is_visible = ? WHERE button_name = ?", (int(visible), button.value))
+            await db_execute("UPDATE button_visibility SET is_visible = ? WHERE button_name = ?", (int(visible), button.value))
             message = f"The '{button.value}' button is now {'visible' if visible else 'hidden'}."
         
-        conn.commit()
         logger.info("Database updated successfully")
+
+        for btn in (button_list if button.value == "all" else [button.value]):
+            _button_visibility_cache[btn] = visible
         
         await interaction.response.send_message(message)
         logger.info(f"Response sent to user: {message}")
@@ -3478,9 +3750,9 @@ async def get_button_visibility_command(interaction: discord.Interaction):
         
         logger.debug(f"Retrieved visibility settings: {visibility}")
         
-        response = "Current button visibility settings:\n\n"
-        for button, is_visible in visibility.items():
-            response += f"{button}: {'Visible' if is_visible else 'Hidden'}\n"
+        response = "Current button visibility settings:\n\n" + "".join(
+            f"{button}: {'Visible' if is_visible else 'Hidden'}\n" for button, is_visible in visibility.items()
+        )
         
         logger.debug(f"Prepared response message: {response}")
         
@@ -3640,7 +3912,7 @@ async def manage_flairs(
 
         # Fetch updated settings after a short delay
         await asyncio.sleep(1)
-        updated_max_flairs, updated_flair_enabled, updated_blacklist = get_flair_settings(forum.id)
+        updated_max_flairs, updated_flair_enabled, updated_blacklist = await get_flair_settings(forum.id)
         logger.info(f"Fetched updated settings after delay for forum {forum.id}: max_flairs={updated_max_flairs}, flair_enabled={updated_flair_enabled}, blacklisted_flairs={updated_blacklist}")
 
     except Exception as e:
@@ -3654,27 +3926,25 @@ async def manage_flairs(
 @bot.tree.command(name="test_warning", description="Test the warning log system")
 async def test_warning(interaction: discord.Interaction):
     logger.warning("This is a test warning message from a slash command")
-    print("Test warning logged to file")
+    logger.debug("Test warning logged to file")
     
     discord_handler = next((handler for handler in logger.handlers if isinstance(handler, DiscordLogHandler)), None)
     if discord_handler:
-        print(f"DiscordLogHandler found with channel ID: {discord_handler.log_channel_id}")
+        logger.debug("DiscordLogHandler found with channel ID: %s", discord_handler.log_channel_id)
     else:
-        print("DiscordLogHandler not found in logger handlers")
+        logger.debug("DiscordLogHandler not found in logger handlers")
     
     await interaction.response.send_message("Test warning message logged. Check console output and Discord log channel.")
 
 @bot.tree.command(name="rotate_logs", description="Manually trigger log rotation")
 async def rotate_logs(interaction: discord.Interaction):
     logger.info("Manually triggering log rotation")
-    print("Manually triggering log rotation")  # Add this line
     
     rotated_files = []
     for handler in logger.handlers:
         if isinstance(handler, DiscordLogHandler):
-            print(f"Found DiscordLogHandler with file: {handler.baseFilename}")
             file_size = os.path.getsize(handler.baseFilename)
-            print(f"Current log file size: {file_size} bytes")
+            logger.debug("Found DiscordLogHandler with file: %s, current log file size: %d bytes", handler.baseFilename, file_size)
             handler.doRollover()
             rotated_files.append(handler.baseFilename)
     
@@ -3861,65 +4131,191 @@ async def help_command(interaction: discord.Interaction):
 # 13. Background Tasks
 # ====================
 
+async def gather_limited(coros, limit=MAX_CONCURRENT_SUBSCRIPTIONS):
+    # Await the coroutines with at most `limit` running at once, returns results (or exceptions) in order
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
+
+def group_by_subreddit(rows):
+    # Group subscription rows by subreddit (first column), keeping their order within each subreddit
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[0], []).append(row)
+    return list(groups.values())
+
+# Adaptive polling for regular subscriptions: a subreddit that returns nothing new is checked less often,
+# backing off from POLL_INTERVAL_MIN by POLL_BACKOFF_FACTOR up to POLL_INTERVAL_MAX, and reset by its next new post.
+# POLL_INTERVAL_MIN is also the period of the check_new_posts loop
+POLL_INTERVAL_MIN = 120
+POLL_INTERVAL_MAX = 1800
+POLL_BACKOFF_FACTOR = 1.5
+_poll_schedule: dict[str, tuple[float, float]] = {}  # subreddit -> (next check on the monotonic clock, interval)
+
+def is_poll_due(subreddit):
+    entry = _poll_schedule.get(subreddit)
+    return entry is None or entry[0] <= time.monotonic()
+
+def schedule_next_poll(subreddit, found_new, tick_started_at):
+    # Counting from the start of the tick keeps a subreddit on the minimum interval due at the very next tick
+    if found_new:
+        interval = POLL_INTERVAL_MIN
+    else:
+        interval = min(_poll_schedule.get(subreddit, (0, POLL_INTERVAL_MIN))[1] * POLL_BACKOFF_FACTOR, POLL_INTERVAL_MAX)
+    _poll_schedule[subreddit] = (tick_started_at + interval, interval)
+    logger.debug("Next check of r/%s in %d seconds", subreddit, interval)
+
+async def process_subreddit_subscriptions(reddit, rows, pending_updates, tick_started_at):
+    # One listing fetch serves every channel subscribed to the subreddit. It reaches back to the oldest
+    # last_check_ts in the group and each channel keeps only the posts newer than its own
+    subreddit = rows[0][0]
+    if len(rows) == 1:
+        _, channel_id, last_check_ts, last_submission_id = rows[0]
+        new_submissions = await process_subscription(reddit, subreddit, channel_id, last_check_ts, last_submission_id, pending_updates)
+        # A failed check is retried next tick instead of being backed off like a quiet subreddit
+        if new_submissions is not None:
+            schedule_next_poll(subreddit, bool(new_submissions), tick_started_at)
+        return
+    subreddit_obj = await reddit.subreddit(subreddit)
+    fetched_submissions = await fetch_new_submissions(subreddit_obj, min(row[2] for row in rows))
+    logger.debug("Fetched r/%s once for %d channels", subreddit, len(rows))
+    # Each channel gets its posts in order, but different channels are posted to at the same time
+    await asyncio.gather(*(
+        process_subscription(reddit, subreddit, channel_id, last_check_ts, last_submission_id, pending_updates, fetched_submissions)
+        for _, channel_id, last_check_ts, last_submission_id in rows
+    ))
+    schedule_next_poll(subreddit, bool(fetched_submissions), tick_started_at)
+
+def group_by_channel(rows):
+    # Group subscription rows by channel_id (second column), keeping their order within each channel
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[1], []).append(row)
+    return list(groups.values())
+
+async def process_forum_subscriptions_in_order(reddit, rows, pending_updates):
+    # Subscriptions sharing a forum edit the same tags/threads, so they run one after another
+    for subreddit, channel_id, thread_id, last_check_ts, last_submission_id in rows:
+        logger.debug("Processing forum subscription: r/%s for channel %d, thread %d", subreddit, channel_id, thread_id)
+        await process_forum_subscription(reddit, subreddit, channel_id, thread_id, last_check_ts, last_submission_id, pending_updates)
+
+async def process_individual_forum_subscriptions_in_order(reddit, rows, pending_updates):
+    for subreddit, channel_id, last_check_ts in rows:
+        logger.debug("Processing individual forum subscription: r/%s for channel %d", subreddit, channel_id)
+        await process_individual_forum_subscription(reddit, subreddit, channel_id, last_check_ts, pending_updates)
+
+def log_gather_errors(kind, groups, results):
+    for rows, result in zip(groups, results):
+        if isinstance(result, Exception):
+            logger.error("Error processing %s subscriptions for channel %d: %s", kind, rows[0][1], result)
+
+async def check_all_subscriptions(reddit, tick_started_at, respect_schedule):
+    # Shared by check_new_posts and consistency_check. With respect_schedule=False every regular
+    # subscription is checked, including quiet subreddits that are still backing off
+
+    # Process regular subscriptions
+    subscriptions = await get_subscriptions()
+    logger.debug("Found %d regular subscriptions to process", len(subscriptions))
+    
+    # Each subscription's new last_check_ts/last_submission_id is collected and written in one transaction
+    pending_updates = []
+    try:
+        subreddit_groups = group_by_subreddit(subscriptions)
+        if respect_schedule:
+            subreddit_groups = [rows for rows in subreddit_groups if is_poll_due(rows[0][0])]
+            logger.debug("%d subreddits due for a check this tick", len(subreddit_groups))
+        results = await gather_limited(process_subreddit_subscriptions(reddit, rows, pending_updates, tick_started_at) for rows in subreddit_groups)
+        for rows, result in zip(subreddit_groups, results):
+            if isinstance(result, Exception):
+                logger.error("Error processing regular subscriptions for r/%s: %s", rows[0][0], result)
+    finally:
+        if pending_updates:
+            await db_executemany(SUBSCRIPTION_STATE_UPDATE, pending_updates)
+            update_subscription_cache(pending_updates)
+            logger.debug("Saved state for %d regular subscriptions", len(pending_updates))
+    
+    # Process forum subscriptions
+    forum_subscriptions = await db_fetchall("SELECT subreddit, channel_id, thread_id, last_check_ts, last_submission_id FROM forum_subscriptions")
+    logger.debug("Found %d forum subscriptions to process", len(forum_subscriptions))
+    
+    # Different forums are processed concurrently, subscriptions within one forum in order
+    forum_updates = []
+    try:
+        forum_groups = group_by_channel(forum_subscriptions)
+        results = await gather_limited(process_forum_subscriptions_in_order(reddit, rows, forum_updates) for rows in forum_groups)
+        log_gather_errors("forum", forum_groups, results)
+    finally:
+        if forum_updates:
+            await db_executemany(FORUM_SUBSCRIPTION_STATE_UPDATE, forum_updates)
+            logger.debug("Saved state for %d forum subscriptions", len(forum_updates))
+    
+    # Process individual forum subscriptions
+    individual_forum_subscriptions = await db_fetchall("SELECT subreddit, channel_id, last_check_ts FROM individual_forum_subscriptions")
+    logger.debug("Found %d individual forum subscriptions to process", len(individual_forum_subscriptions))
+    
+    individual_forum_updates = []
+    try:
+        individual_forum_groups = group_by_channel(individual_forum_subscriptions)
+        results = await gather_limited(process_individual_forum_subscriptions_in_order(reddit, rows, individual_forum_updates) for rows in individual_forum_groups)
+        log_gather_errors("individual forum", individual_forum_groups, results)
+    finally:
+        if individual_forum_updates:
+            await db_executemany(INDIVIDUAL_FORUM_SUBSCRIPTION_STATE_UPDATE, individual_forum_updates)
+            logger.debug("Saved state for %d individual forum subscriptions", len(individual_forum_updates))
+
 async def check_new_posts():
     while True:
         logger.info("Starting check for new posts")
         start_time = time.time()
+        # Ticks start POLL_INTERVAL_MIN apart on the monotonic clock, however long each one takes
+        tick_started_at = time.monotonic()
+        deadline = tick_started_at + POLL_INTERVAL_MIN
 
         # Clear the processed_submissions dictionary
         processed_submissions.clear()
         logger.debug("Cleared processed_submissions dictionary")
+        # Pick up button visibility changes made outside the bot before this tick posts anything
+        await refresh_button_visibility()
         
-        async with aiohttp.ClientSession() as session:
-            reddit = asyncpraw.Reddit(client_id=REDDIT_CLIENT_ID,
-                                      client_secret=REDDIT_CLIENT_SECRET,
-                                      user_agent=REDDIT_USER_AGENT,
-                                      requestor_kwargs={'session': session})
-            
-            try:
-                # Process regular subscriptions
-                c.execute("SELECT subreddit, channel_id, last_check, last_submission_id FROM subscriptions")
-                subscriptions = c.fetchall()
-                logger.debug("Found %d regular subscriptions to process", len(subscriptions))
-                
-                for subreddit, channel_id, last_check, last_submission_id in subscriptions:
-                    logger.debug("Processing regular subscription: r/%s for channel %d", subreddit, channel_id)
-                    processed_ids = await process_subscription(reddit, subreddit, channel_id, last_check, last_submission_id)
-                    if processed_ids:
-                        newest_id = max(processed_ids)
-                        c.execute("UPDATE subscriptions SET last_submission_id = ? WHERE subreddit = ? AND channel_id = ?",
-                                  (newest_id, subreddit, channel_id))
-                        conn.commit()
-                        logger.info("Updated last_submission_id for r/%s in channel %d", subreddit, channel_id)
-                
-                # Process forum subscriptions
-                c.execute("SELECT subreddit, channel_id, thread_id, last_check, last_submission_id FROM forum_subscriptions")
-                forum_subscriptions = c.fetchall()
-                logger.debug("Found %d forum subscriptions to process", len(forum_subscriptions))
-                
-                for subreddit, channel_id, thread_id, last_check, last_submission_id in forum_subscriptions:
-                    logger.debug("Processing forum subscription: r/%s for channel %d, thread %d", subreddit, channel_id, thread_id)
-                    await process_forum_subscription(reddit, subreddit, channel_id, thread_id, last_check, last_submission_id)
-                
-                # Process individual forum subscriptions
-                c.execute("SELECT subreddit, channel_id, last_check FROM individual_forum_subscriptions")
-                individual_forum_subscriptions = c.fetchall()
-                logger.debug("Found %d individual forum subscriptions to process", len(individual_forum_subscriptions))
-                
-                for subreddit, channel_id, last_check in individual_forum_subscriptions:
-                    logger.debug("Processing individual forum subscription: r/%s for channel %d", subreddit, channel_id)
-                    await process_individual_forum_subscription(reddit, subreddit, channel_id, last_check)
-            
-            except Exception as e:
-                logger.error("Error occurred while checking for new posts: %s", str(e), exc_info=True)
+        reddit = asyncpraw.Reddit(client_id=REDDIT_CLIENT_ID,
+                                  client_secret=REDDIT_CLIENT_SECRET,
+                                  user_agent=REDDIT_USER_AGENT,
+                                  requestor_kwargs={'session': get_http_session()})
+        
+        try:
+            await check_all_subscriptions(reddit, tick_started_at, respect_schedule=True)
+        except Exception as e:
+            logger.error("Error occurred while checking for new posts: %s", str(e), exc_info=True)
         
         end_time = time.time()
         duration = round(end_time - start_time, 2)
         logger.info("Finished checking for new posts. Duration: %d seconds", duration)
 
-        # Wait for 2 minutes after the loop finishes
-        logger.info("Waiting for 2 minutes before next check")
-        await asyncio.sleep(120)
+        remaining = deadline - time.monotonic()
+        if remaining < 0:
+            logger.warning("Check for new posts overran its %d second interval by %.1f seconds, starting the next one now", POLL_INTERVAL_MIN, -remaining)
+        else:
+            logger.info("Waiting %.1f seconds before next check", remaining)
+        await asyncio.sleep(max(0, remaining))
+
+async def supervise_check_new_posts():
+    # check_new_posts handles errors per tick, this restarts it if anything escapes,
+    # doubling the wait after each crash up to 10 minutes and resetting it once a run lasts that long
+    delay = 5
+    while True:
+        started_at = time.monotonic()
+        try:
+            await check_new_posts()
+        except Exception as e:
+            if time.monotonic() - started_at >= 600:
+                delay = 5
+            logger.error("check_new_posts stopped unexpectedly: %s. Restarting in %d seconds", e, delay, exc_info=True)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 600)
 
 async def check_subreddit(reddit, subreddit_name, channel_id, thread_id, button_visibility):
     logger.info(f"Checking subreddit: r/{subreddit_name} for channel {channel_id}, thread {thread_id}")
@@ -3936,24 +4332,22 @@ async def check_subreddit(reddit, subreddit_name, channel_id, thread_id, button_
             logger.warning(f"Thread not found: {thread_id}")
             return
 
-    last_check, last_submission_id = await get_tracking(subreddit_name, channel_id)
-    logger.debug(f"Last check for r/{subreddit_name}: {last_check}, Last submission ID: {last_submission_id}")
+    last_check_ts, last_submission_id = await get_tracking(subreddit_name, channel_id)
+    logger.debug(f"Last check for r/{subreddit_name}: {last_check_ts}, Last submission ID: {last_submission_id}")
 
     max_attempts = 3
     attempts = 0
     while attempts < max_attempts:
         try:
             subreddit = await reddit.subreddit(subreddit_name)
-            new_last_check = datetime.now(timezone.utc)
+            new_last_check_ts = int(time.time())
             new_last_submission_id = last_submission_id
 
-            new_submissions = await fetch_new_submissions(subreddit, last_check)
+            new_submissions = await fetch_new_submissions(subreddit, last_check_ts)
             logger.debug(f"Fetched {len(new_submissions)} new submissions for r/{subreddit_name}")
             
             for submission in reversed(new_submissions):
-                submission_time = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
-                
-                if submission_time <= last_check or submission.id == last_submission_id:
+                if submission.created_utc <= last_check_ts or submission.id == last_submission_id:
                     break
                 
                 if new_last_submission_id is None:
@@ -3996,8 +4390,8 @@ async def check_subreddit(reddit, subreddit_name, channel_id, thread_id, button_
 
                 logger.info(f"Posted to Discord: r/{subreddit_name} - {submission.title}")
 
-            await update_tracking(subreddit_name, channel_id, new_last_check, new_last_submission_id)
-            logger.debug(f"Updated tracking for r/{subreddit_name}: Last check: {new_last_check}, Last submission ID: {new_last_submission_id}")
+            await update_tracking(subreddit_name, channel_id, new_last_check_ts, new_last_submission_id)
+            logger.debug(f"Updated tracking for r/{subreddit_name}: Last check: {new_last_check_ts}, Last submission ID: {new_last_submission_id}")
             return  # Exit the function if successful
 
         except asyncprawcore.exceptions.Forbidden:
@@ -4029,10 +4423,11 @@ async def cleanup_subscriptions():
     logger.info("Starting comprehensive cleanup of stale subscriptions")
     start_time = time.time()
 
+    # Deletes are collected while checking and applied together in one transaction at the end
+    deletes = []
     try:
         # Cleanup forum_subscriptions
-        c.execute("SELECT subreddit, channel_id, thread_id FROM forum_subscriptions")
-        forum_subscriptions = c.fetchall()
+        forum_subscriptions = await db_fetchall("SELECT subreddit, channel_id, thread_id FROM forum_subscriptions")
         logger.debug(f"Found {len(forum_subscriptions)} forum subscriptions to check")
         
         forum_subs_removed = 0
@@ -4042,20 +4437,19 @@ async def cleanup_subscriptions():
             
             if channel is None or not isinstance(channel, discord.ForumChannel):
                 logger.warning(f"Removing stale forum subscription: r/{subreddit} in channel {channel_id}, thread {thread_id} - Forum not found")
-                c.execute("DELETE FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ?", 
-                          (subreddit, channel_id))
+                deletes.append(("DELETE FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ?", 
+                                (subreddit, channel_id)))
                 forum_subs_removed += 1
             elif thread is None:
                 logger.warning(f"Removing stale forum subscription: r/{subreddit} in channel {channel_id}, thread {thread_id} - Thread not found")
-                c.execute("DELETE FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ? AND thread_id = ?", 
-                          (subreddit, channel_id, thread_id))
+                deletes.append(("DELETE FROM forum_subscriptions WHERE subreddit = ? AND channel_id = ? AND thread_id = ?", 
+                                (subreddit, channel_id, thread_id)))
                 forum_subs_removed += 1
         
         logger.info(f"Removed {forum_subs_removed} stale forum subscriptions")
 
         # Cleanup individual_forum_subscriptions
-        c.execute("SELECT subreddit, channel_id FROM individual_forum_subscriptions")
-        individual_subscriptions = c.fetchall()
+        individual_subscriptions = await db_fetchall("SELECT subreddit, channel_id FROM individual_forum_subscriptions")
         logger.debug(f"Found {len(individual_subscriptions)} individual forum subscriptions to check")
         
         individual_subs_removed = 0
@@ -4064,15 +4458,14 @@ async def cleanup_subscriptions():
             
             if channel is None or not isinstance(channel, discord.ForumChannel):
                 logger.warning(f"Removing stale individual forum subscription: r/{subreddit} in channel {channel_id} - Forum not found")
-                c.execute("DELETE FROM individual_forum_subscriptions WHERE subreddit = ? AND channel_id = ?", 
-                          (subreddit, channel_id))
+                deletes.append(("DELETE FROM individual_forum_subscriptions WHERE subreddit = ? AND channel_id = ?", 
+                                (subreddit, channel_id)))
                 individual_subs_removed += 1
         
         logger.info(f"Removed {individual_subs_removed} stale individual forum subscriptions")
 
         # Cleanup regular subscriptions
-        c.execute("SELECT subreddit, channel_id FROM subscriptions")
-        regular_subscriptions = c.fetchall()
+        regular_subscriptions = await db_fetchall("SELECT subreddit, channel_id FROM subscriptions")
         logger.debug(f"Found {len(regular_subscriptions)} regular subscriptions to check")
         
         regular_subs_removed = 0
@@ -4081,18 +4474,20 @@ async def cleanup_subscriptions():
             
             if channel is None:
                 logger.warning(f"Removing stale regular subscription: r/{subreddit} in channel {channel_id} - Channel not found")
-                c.execute("DELETE FROM subscriptions WHERE subreddit = ? AND channel_id = ?", 
-                          (subreddit, channel_id))
+                deletes.append(("DELETE FROM subscriptions WHERE subreddit = ? AND channel_id = ?", 
+                                (subreddit, channel_id)))
                 regular_subs_removed += 1
         
         logger.info(f"Removed {regular_subs_removed} stale regular subscriptions")
 
-        conn.commit()
-        logger.info("Database changes committed successfully")
+        if deletes:
+            await db_execute_all(deletes)
+            logger.info("Database changes committed successfully")
+        if regular_subs_removed:
+            invalidate_subscription_cache()
 
     except Exception as e:
         logger.error(f"Error during cleanup_subscriptions: {str(e)}", exc_info=True)
-        conn.rollback()
         logger.info("Database changes rolled back due to error")
 
     end_time = time.time()
@@ -4118,53 +4513,13 @@ async def consistency_check():
     start_time = time.time()
 
     try:
-        async with aiohttp.ClientSession() as session:
-            reddit = asyncpraw.Reddit(client_id=REDDIT_CLIENT_ID,
-                                      client_secret=REDDIT_CLIENT_SECRET,
-                                      user_agent=REDDIT_USER_AGENT,
-                                      requestor_kwargs={'session': session})
-
-            # Check regular subscriptions
-            c.execute("SELECT subreddit, channel_id, last_check, last_submission_id FROM subscriptions")
-            subscriptions = c.fetchall()
-            logger.info(f"Total regular subscriptions to check: {len(subscriptions)}")
-            for i, (subreddit, channel_id, last_check, last_submission_id) in enumerate(subscriptions, 1):
-                logger.info(f"Checking regular subscription {i}/{len(subscriptions)}: r/{subreddit}")
-                try:
-                    processed_ids = await process_subscription(reddit, subreddit, channel_id, last_check, last_submission_id)
-                    if processed_ids:
-                        newest_id = max(processed_ids)
-                        c.execute("UPDATE subscriptions SET last_submission_id = ? WHERE subreddit = ? AND channel_id = ?",
-                                  (newest_id, subreddit, channel_id))
-                        conn.commit()
-                        logger.debug(f"Updated last_submission_id for r/{subreddit} in channel {channel_id}")
-                except Exception as e:
-                    logger.error(f"Error processing regular subscription for r/{subreddit}: {str(e)}", exc_info=True)
-                await asyncio.sleep(2)  # Add a small delay between checks
-
-            # Check forum subscriptions
-            c.execute("SELECT subreddit, channel_id, thread_id, last_check, last_submission_id FROM forum_subscriptions")
-            forum_subscriptions = c.fetchall()
-            logger.info(f"Total forum subscriptions to check: {len(forum_subscriptions)}")
-            for i, (subreddit, channel_id, thread_id, last_check, last_submission_id) in enumerate(forum_subscriptions, 1):
-                logger.info(f"Checking forum subscription {i}/{len(forum_subscriptions)}: r/{subreddit}")
-                try:
-                    await process_forum_subscription(reddit, subreddit, channel_id, thread_id, last_check, last_submission_id)
-                except Exception as e:
-                    logger.error(f"Error processing forum subscription for r/{subreddit}: {str(e)}", exc_info=True)
-                await asyncio.sleep(2)  # Add a small delay between checks
-
-            # Check individual forum subscriptions
-            c.execute("SELECT subreddit, channel_id, last_check FROM individual_forum_subscriptions")
-            individual_forum_subscriptions = c.fetchall()
-            logger.info(f"Total individual forum subscriptions to check: {len(individual_forum_subscriptions)}")
-            for i, (subreddit, channel_id, last_check) in enumerate(individual_forum_subscriptions, 1):
-                logger.info(f"Checking individual forum subscription {i}/{len(individual_forum_subscriptions)}: r/{subreddit}")
-                try:
-                    await process_individual_forum_subscription(reddit, subreddit, channel_id, last_check)
-                except Exception as e:
-                    logger.error(f"Error processing individual forum subscription for r/{subreddit}: {str(e)}", exc_info=True)
-                await asyncio.sleep(2)  # Add a small delay between checks
+        session = get_http_session()
+        reddit = asyncpraw.Reddit(client_id=REDDIT_CLIENT_ID,
+                                  client_secret=REDDIT_CLIENT_SECRET,
+                                  user_agent=REDDIT_USER_AGENT,
+                                  requestor_kwargs={'session': session})
+
+        await check_all_subscriptions(reddit, time.monotonic(), respect_schedule=False)
 
     except Exception as e:
         logger.error(f"Error during consistency check: {str(e)}", exc_info=True)
@@ -4189,20 +4544,15 @@ async def after_consistency_check():
 # 14. Event Handlers
 # ==================
 
+# Handle for the check_new_posts coroutine, so a reconnect's on_ready does not start a second copy
+check_new_posts_task = None
+
 @bot.event
 async def on_ready():
+    global check_new_posts_task
     logger.info('Logged in as %s (ID: %s)', bot.user, bot.user.id)
     try:
-        if commands_have_changed(bot):
-            logger.info("Commands have changed. Starting sync...")
-            sync_start = time.time()
-            synced = await bot.tree.sync()
-            sync_end = time.time()
-            logger.info("Synced %d command(s) in %.2f seconds", len(synced), sync_end - sync_start)
-            update_command_cache(bot)
-        else:
-            logger.info("Commands haven't changed. Skipping initial sync.")
-        
+        # Apply the debug command permissions first so one comparison (and at most one sync) covers both
         logger.info("Setting permissions for debug commands...")
         perm_start = time.time()
         debug_commands = [
@@ -4220,29 +4570,32 @@ async def on_ready():
                 modified_commands += 1
         perm_end = time.time()
         logger.info("Set permissions for %d commands in %.2f seconds", modified_commands, perm_end - perm_start)
-        
-        if modified_commands > 0:
-            logger.info("Permissions changed. Syncing tree again...")
-            resync_start = time.time()
-            resynced = await bot.tree.sync()
-            resync_end = time.time()
-            logger.info("Resynced %d commands in %.2f seconds", len(resynced), resync_end - resync_start)
+
+        if commands_have_changed(bot):
+            logger.info("Commands have changed. Starting sync...")
+            sync_start = time.time()
+            synced = await bot.tree.sync()
+            sync_end = time.time()
+            logger.info("Synced %d command(s) in %.2f seconds", len(synced), sync_end - sync_start)
             update_command_cache(bot)
         else:
-            logger.info("No permission changes. Skipping resync.")
+            logger.info("Commands haven't changed. Skipping sync.")
         
+        # on_ready fires again after every gateway reconnect, only start what is not already running
         logger.info("Starting background tasks...")
         tasks_start = time.time()
-        bot.loop.create_task(check_new_posts())
-        logger.info("check_new_posts task created")
-        cleanup_subscriptions.start()
-        logger.info("cleanup_subscriptions started")
-        consistency_check.start()
-        logger.info("consistency_check started")
-        periodic_log.start()
-        logger.info("periodic_log started")
+        started = 0
+        if check_new_posts_task is None or check_new_posts_task.done():
+            check_new_posts_task = bot.loop.create_task(supervise_check_new_posts())
+            logger.info("check_new_posts task created")
+            started += 1
+        for task in (cleanup_subscriptions, consistency_check, periodic_log):
+            if not task.is_running():
+                task.start()
+                logger.info("%s started", task.coro.__name__)
+                started += 1
         tasks_end = time.time()
-        logger.info("Started %d background tasks in %.2f seconds", 4, tasks_end - tasks_start)
+        logger.info("Started %d background tasks in %.2f seconds", started, tasks_end - tasks_start)
         logger.info("Bot is fully ready and connected to %d guilds", len(bot.guilds))
         
     except Exception as e:
@@ -4301,11 +4654,15 @@ if __name__ == "__main__":
         logger.info("Bot is shutting down...")
         # Close the database connection
         try:
+            db_executor.submit(_close_db_worker_conn)
+            db_executor.shutdown(wait=True)
             conn.close()
             logger.info("Database connection closed successfully.")
         except Exception as e:
             logger.error(f"Error closing database connection: {e}", exc_info=True)
         
         logger.info("Shutdown complete.")
+        # Flush whatever is still queued for the console and discord_bot.log
+        log_listener.stop()
         logging.shutdown()
         sys.exit(0)
\ No newline at end of file
@@ -0,0 +1,42 @@
+import ast
+import pathlib
+import re
+import unittest
+
+BOT_SOURCE = pathlib.Path(__file__).resolve().parent.parent / 'Config Files' / 'reddit_discord_bot.py'
+
+
+def load_classify_url():
+    # The bot module needs discord/asyncpraw and a .env at import time, so only the regex and classify_url are compiled here
+    tree = ast.parse(BOT_SOURCE.read_text(encoding='utf-8'))
+    nodes = [node for node in tree.body
+             if (isinstance(node, ast.FunctionDef) and node.name == 'classify_url')
+             or (isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == '_URL_KIND_RE' for target in node.targets))]
+    namespace = {'re': re}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(BOT_SOURCE), 'exec'), namespace)
+    return namespace['classify_url']
+
+
+class ClassifyUrlTests(unittest.TestCase):
+    def setUp(self):
+        self.classify_url = load_classify_url()
+
+    def test_single_kind(self):
+        self.assertEqual(self.classify_url('https://www.youtube.com/watch?v=dQw4w9WgXcQ'), 'youtube')
+        self.assertEqual(self.classify_url('https://youtu.be/dQw4w9WgXcQ'), 'youtube')
+        self.assertEqual(self.classify_url('https://www.redgifs.com/watch/abc'), 'redgifs')
+        self.assertEqual(self.classify_url('https://www.reddit.com/gallery/abc123'), 'gallery')
+        self.assertIsNone(self.classify_url('https://i.redd.it/abc.jpg'))
+        self.assertIsNone(self.classify_url('https://example.com/galleryx'))
+
+    def test_leftmost_marker_wins(self):
+        # A URL gets exactly one kind: the marker that appears first in it, whatever the kind
+        self.assertEqual(self.classify_url('https://www.youtube.com/redirect?q=https://redgifs.com/watch/abc'), 'youtube')
+        self.assertEqual(self.classify_url('https://www.redgifs.com/watch/abc?ref=youtube.com'), 'redgifs')
+        self.assertEqual(self.classify_url('https://www.redgifs.com/gallery/abc'), 'redgifs')
+        self.assertEqual(self.classify_url('https://www.reddit.com/gallery/abc?from=youtu.be'), 'gallery')
+        self.assertEqual(self.classify_url('https://out.reddit.com/gallery/x?u=https://www.redgifs.com/watch/abc'), 'gallery')
+
+
+if __name__ == '__main__':
+    unittest.main()
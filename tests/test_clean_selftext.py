@@ -0,0 +1,70 @@
+import ast
+import html
+import pathlib
+import random
+import re
+import unittest
+
+BOT_SOURCE = pathlib.Path(__file__).resolve().parent.parent / 'Config Files' / 'reddit_discord_bot.py'
+
+
+def load_clean_selftext():
+    # The bot module needs discord/asyncpraw and a .env at import time, so only clean_selftext, its helper
+    # and the module-level compiled patterns are compiled here
+    tree = ast.parse(BOT_SOURCE.read_text(encoding='utf-8'))
+    nodes = [node for node in tree.body
+             if (isinstance(node, ast.FunctionDef) and node.name in ('clean_selftext', '_collapse_whitespace'))
+             or (isinstance(node, ast.Assign) and any(getattr(target, 'id', '').endswith('_RE') for target in node.targets))]
+    namespace = {'re': re, 'html': html}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(BOT_SOURCE), 'exec'), namespace)
+    return namespace['clean_selftext']
+
+
+# The previous version with two whitespace passes, kept as the reference behaviour
+def reference_clean_selftext(selftext):
+    cleaned_text = re.sub(r'https?://(?:preview|i)\.redd\.it/\S+', '', selftext)
+
+    def replace_link(match):
+        text, url = match.groups()
+        if text.strip() == url.strip():
+            return url
+        return f"{text} {url}"
+
+    cleaned_text = re.sub(r'\[(.*?)\]\((.*?)\)', replace_link, cleaned_text)
+    cleaned_text = re.sub(r'[\[\]]', '', cleaned_text)
+    cleaned_text = re.sub(r'\($', '', cleaned_text)
+    cleaned_text = re.sub(r'\($', '', cleaned_text, flags=re.MULTILINE)
+    cleaned_text = re.sub(r'&nbsp;', ' ', cleaned_text)
+    cleaned_text = html.unescape(cleaned_text)
+    cleaned_text = re.sub(r' +', ' ', cleaned_text)
+    cleaned_text = re.sub(r'\n\s*\n', '\n\n', cleaned_text)
+    return cleaned_text.strip()
+
+
+# Weighted towards whitespace, since the whitespace pass is what changed
+PIECES = [' ', ' ', '  ', '   ', '\n', '\n', '\n\n', '\t', '\r', '\r\n', '\x0b', ' ', ' ', 'a', 'word', '.',
+          '(', ')', '[', ']', '[text](https://example.com)', '[https://x.io](https://x.io)', '&nbsp;', '&amp;', '&nb',
+          'sp;', '&#32;', '&#10;', 'https://i.redd.it/abc.jpg', 'https://preview.redd.it/x.png?width=640 ']
+
+
+def random_selftext(rng):
+    return ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 40)))
+
+
+class CleanSelftextEquivalenceTests(unittest.TestCase):
+    def test_matches_two_pass_reference_on_random_text(self):
+        clean_selftext = load_clean_selftext()
+        rng = random.Random(1116)
+        for _ in range(50000):
+            text = random_selftext(rng)
+            self.assertEqual(clean_selftext(text), reference_clean_selftext(text), repr(text))
+
+    def test_whitespace_collapse(self):
+        clean_selftext = load_clean_selftext()
+        self.assertEqual(clean_selftext('a   b\n\n\n\nc'), 'a b\n\nc')
+        self.assertEqual(clean_selftext('a \n \t \n  b'), 'a \n\n b')
+        self.assertEqual(clean_selftext('  [link](https://example.com)  '), 'link https://example.com')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import ast
+import asyncio
+import logging
+import pathlib
+import unittest
+
+BOT_SOURCE = pathlib.Path(__file__).resolve().parent.parent / 'Config Files' / 'reddit_discord_bot.py'
+
+
+class FakeContent:
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self.body), size):
+            await asyncio.sleep(0)
+            yield self.body[start:start + size]
+
+
+class FakeResponse:
+    def __init__(self, body, status=200, content_length=None):
+        self.status = status
+        self.content_length = content_length
+        self.headers = {} if content_length is None else {'Content-Length': str(content_length)}
+        self.content = FakeContent(body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url):
+        return self.response
+
+
+def load_download_video(response):
+    # The bot module needs discord/asyncpraw and a .env at import time, so only download_video is compiled here
+    tree = ast.parse(BOT_SOURCE.read_text(encoding='utf-8'))
+    function = next(node for node in tree.body if isinstance(node, ast.AsyncFunctionDef) and node.name == 'download_video')
+    namespace = {'get_http_session': lambda: FakeSession(response), 'logger': logging.getLogger(__name__)}
+    exec(compile(ast.Module(body=[function], type_ignores=[]), str(BOT_SOURCE), 'exec'), namespace)
+    return namespace['download_video']
+
+
+class DownloadVideoTests(unittest.IsolatedAsyncioTestCase):
+    async def test_returns_whole_multi_chunk_body(self):
+        body = bytes(range(256)) * 2560  # 655360 bytes, ten 64 KB chunks
+        download_video = load_download_video(FakeResponse(body))
+        self.assertEqual(await download_video('https://example.com/video.mp4', len(body)), body)
+
+    async def test_rejects_body_over_max_size_without_content_length(self):
+        download_video = load_download_video(FakeResponse(b'x' * 200000))
+        self.assertIsNone(await download_video('https://example.com/video.mp4', 100000))
+
+    async def test_rejects_oversized_content_length(self):
+        download_video = load_download_video(FakeResponse(b'x', content_length=200000))
+        self.assertIsNone(await download_video('https://example.com/video.mp4', 100000))
+
+    async def test_non_200_response(self):
+        download_video = load_download_video(FakeResponse(b'x', status=404))
+        self.assertIsNone(await download_video('https://example.com/video.mp4', 100000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import ast
+import pathlib
+import random
+import types
+import unittest
+from urllib.parse import urlparse, parse_qs
+
+BOT_SOURCE = pathlib.Path(__file__).resolve().parent.parent / 'Config Files' / 'reddit_discord_bot.py'
+
+
+def load_functions(*names):
+    # The bot module needs discord/asyncpraw and a .env at import time, so only the named functions are compiled here
+    tree = ast.parse(BOT_SOURCE.read_text(encoding='utf-8'))
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in names]
+    namespace = {'urlparse': urlparse, 'parse_qs': parse_qs}
+    exec(compile(ast.Module(body=functions, type_ignores=[]), str(BOT_SOURCE), 'exec'), namespace)
+    return [namespace[name] for name in names]
+
+
+# The urlparse-only versions the string checks replaced, kept as the reference behaviour
+def reference_extract_image_url(submission):
+    parsed_url = urlparse(submission.url)
+    if parsed_url.netloc == 'preview.redd.it':
+        path = parsed_url.path
+        if path.endswith(('.jpg', '.png', '.gif')):
+            return f"https://i.redd.it{path}"
+    elif parsed_url.netloc in ['i.redd.it', 'i.imgur.com']:
+        return submission.url
+    return None
+
+
+def reference_extract_video_id(url):
+    parsed_url = urlparse(url)
+    if parsed_url.netloc in ('youtu.be', 'www.youtu.be'):
+        return parsed_url.path[1:]
+    if parsed_url.netloc in ('youtube.com', 'www.youtube.com'):
+        query = parse_qs(parsed_url.query)
+        return query.get('v', [None])[0]
+    return None
+
+
+SCHEMES = ['https://', 'http://', 'HTTPS://', 'ftp://', '//', '']
+HOSTS = ['i.redd.it', 'preview.redd.it', 'i.imgur.com', 'youtube.com', 'www.youtube.com', 'youtu.be',
+         'www.youtu.be', 'example.com', 'i.redd.it.example.com', 'preview.redd.it:443', 'user@i.redd.it',
+         'I.REDD.IT', 'm.youtube.com', 'redgifs.com']
+PATHS = ['/abc.jpg', '/abc.png', '/x/y.gif', '/abc.jpeg', '/', '', '/a;b.jpg', '/a.jpg;p', '/watch',
+         '/dQw4w9WgXcQ', '/i.redd.it/a.png', '/preview.redd.it/b.gif', '/r/pics/comments/x/y/']
+SUFFIXES = ['', '?width=640&format=pjpg', '?v=abc123', '?v=abc&t=1', '?a=1;b=2', '#frag', '?x=1#y',
+            '?v=', '?v=a&v=b', '&v=x']
+
+
+def random_url(rng):
+    url = rng.choice(SCHEMES) + rng.choice(HOSTS) + rng.choice(PATHS) + rng.choice(SUFFIXES)
+    if rng.random() < 0.2:
+        # Splice in a few arbitrary characters to reach the less regular inputs
+        position = rng.randrange(len(url) + 1)
+        url = url[:position] + ''.join(rng.choice('/?#;:.@=&% abcjpgiredtuy') for _ in range(rng.randint(1, 4))) + url[position:]
+    return url
+
+
+class UrlExtractionEquivalenceTests(unittest.TestCase):
+    def test_matches_urlparse_reference_on_random_urls(self):
+        extract_image_url, extract_video_id = load_functions('extract_image_url', 'extract_video_id')
+        rng = random.Random(1012)
+        for _ in range(50000):
+            url = random_url(rng)
+            submission = types.SimpleNamespace(url=url)
+            self.assertEqual(extract_image_url(submission), reference_extract_image_url(submission), url)
+            self.assertEqual(extract_video_id(url), reference_extract_video_id(url), url)
+
+    def test_common_links(self):
+        extract_image_url, extract_video_id = load_functions('extract_image_url', 'extract_video_id')
+        self.assertEqual(extract_image_url(types.SimpleNamespace(url='https://preview.redd.it/abc.png?width=640')),
+                         'https://i.redd.it/abc.png')
+        self.assertEqual(extract_image_url(types.SimpleNamespace(url='https://i.imgur.com/abc.jpg')), 'https://i.imgur.com/abc.jpg')
+        self.assertIsNone(extract_image_url(types.SimpleNamespace(url='https://example.com/abc.jpg')))
+        self.assertEqual(extract_video_id('https://www.youtube.com/watch?v=dQw4w9WgXcQ'), 'dQw4w9WgXcQ')
+        self.assertEqual(extract_video_id('https://youtu.be/dQw4w9WgXcQ'), 'dQw4w9WgXcQ')
+        self.assertIsNone(extract_video_id('https://example.com/watch?v=dQw4w9WgXcQ'))
+
+
+if __name__ == '__main__':
+    unittest.main()